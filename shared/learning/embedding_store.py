@@ -4,40 +4,216 @@ SQLite-backed embedding storage for file search indexing.
 
 Stores file embeddings at ~/.ai_os/embeddings.db for fast
 similarity search across indexed files.
+
+SQLite is the source of truth. Vectors are L2-normalized on insert
+and stored compactly (int8 with a per-vector scale by default, or
+float16/float32). For similarity search they are also decoded once into
+a contiguous float16 matrix (a .npy snapshot next to the database) that
+is memory-mapped instead of being rebuilt from per-row BLOBs on every
+query. Every write bumps a generation counter in the store_meta table;
+a snapshot is only reused while its generation matches.
+
+When faiss is installed, unfiltered top-k search runs through a faiss
+index built from the snapshot and persisted alongside it: an exact
+IndexFlatIP for small stores, and an approximate HNSW graph over 8-bit
+scalar-quantized vectors once the store holds HNSW_MIN_ROWS vectors, so
+query time stops growing linearly with the number of indexed files.
+NumPy and faiss are imported on first use, so bookkeeping calls such as
+is_indexed() and get_stats() never pay their import cost.
 """
 
+import os
+import uuid
 import sqlite3
-import numpy as np
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Tuple, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Tuple, Dict, Any, Iterable, Iterator
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 DEFAULT_DB_PATH = Path.home() / ".ai_os" / "embeddings.db"
 
+# Connection tuning applied to every connection:
+# - WAL lets readers proceed while a writer commits
+# - synchronous=NORMAL only fsyncs at checkpoints under WAL
+# - a ~20MB page cache keeps the B-tree hot
+# - up to 1GB of the file is memory-mapped so BLOB reads come straight
+#   from the OS page cache instead of through SQLite's pager
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=1073741824",
+)
+
+# Bump when _init_db() changes; stored in PRAGMA user_version so
+# existing databases skip schema setup on open
+SCHEMA_VERSION = 2
+
+# Rows written through add_embeddings_bulk() before the planner
+# statistics are refreshed with ANALYZE
+ANALYZE_THRESHOLD = 1000
+
+# On-disk vector encodings. int8 stores round(v / scale) with
+# scale = max|v| / 127 kept in the embedding_scale column.
+STORAGE_DTYPES = ("float32", "float16", "int8")
+DEFAULT_STORAGE_DTYPE = "int8"
+
+# In-memory/snapshot matrix encoding. Unit vectors keep ~3 significant
+# digits in float16, plenty for ranking, at half the bytes per query scan.
+SNAPSHOT_DTYPE = "float16"
+
+# Rows upcast to float32 per block while scoring a float16 snapshot
+SCORE_BLOCK_ROWS = 16384
+
+# Stores with at least this many vectors are searched through a faiss
+# HNSW graph instead of an exact flat scan
+HNSW_MIN_ROWS = 5000
+
+# HNSW graph degree and build/search beam widths; efSearch is raised to k
+# when more results are requested
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+
+_UPSERT_SQL = """
+    INSERT OR REPLACE INTO file_embeddings
+    (file_path, file_name, content_type, content_summary,
+     embedding, embedding_dim, embedding_dtype, embedding_scale,
+     file_hash, file_modified, indexed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class EmbeddingStore:
     """
     SQLite-backed embedding storage at ~/.ai_os/embeddings.db
 
     Stores file embeddings as binary blobs alongside metadata
-    for efficient retrieval and similarity search.
+    for efficient retrieval and similarity search, plus a memory-mapped
+    matrix snapshot for loading all vectors at once.
+
+    A single connection is kept open for the lifetime of the store so
+    SQLite's page cache and compiled statements are reused across calls.
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        storage_dtype: str = DEFAULT_STORAGE_DTYPE
+    ):
         """
         Initialize embedding store.
 
         Args:
             db_path: Custom path for database (default: ~/.ai_os/embeddings.db)
+            storage_dtype: Encoding for newly written vectors
+                ("int8", "float16" or "float32"). Rows written with a
+                different encoding remain readable.
         """
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(
+                f"storage_dtype must be one of {STORAGE_DTYPES}, got {storage_dtype!r}"
+            )
+
         self.db_path = db_path or DEFAULT_DB_PATH
+        self.storage_dtype = storage_dtype
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
+        self.snapshot_dir = self.db_path.parent / f"{self.db_path.stem}_vectors"
+        self._lock = threading.RLock()
+        self._snapshot: Optional[Tuple[str, "np.ndarray", "np.ndarray"]] = None
+        self._faiss_index: Optional[Tuple[str, "faiss.Index"]] = None
+        self._rows_since_analyze = 0
+        self._stats: Optional[Tuple[int, int, Optional[int], Dict[str, int]]] = None
+        self._conn = self._connect()
+
+        # Schema setup is skipped for databases already at SCHEMA_VERSION
+        user_version = self._exec("PRAGMA user_version").fetchone()[0]
+        if user_version != SCHEMA_VERSION:
+            self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection to the database with tuned PRAGMAs applied.
+
+        The connection runs in autocommit mode; writes are grouped
+        explicitly with _transaction().
+        """
+        conn = sqlite3.connect(
+            str(self.db_path),
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _transaction(self, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+        """
+        Run a block of statements inside a single BEGIN ... COMMIT.
+
+        Writes use BEGIN IMMEDIATE, which takes the write lock up front so
+        concurrent writers wait on busy_timeout instead of failing
+        mid-transaction. Reads that must see one consistent version of
+        the table use mode="DEFERRED".
+        """
+        with self._lock:
+            self._conn.execute(f"BEGIN {mode}")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+
+    def _exec(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        """Execute a single statement on the shared connection."""
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def _executemany(self, sql: str, seq_of_params: Iterable[Iterable[Any]]) -> sqlite3.Cursor:
+        """Execute a statement for each parameter tuple inside one transaction."""
+        with self._transaction() as conn:
+            cursor = conn.executemany(sql, seq_of_params)
+            self._mark_modified(conn)
+            return cursor
+
+    @staticmethod
+    def _mark_modified(conn: sqlite3.Connection):
+        """Bump the data generation so cached snapshots are rebuilt."""
+        conn.execute(
+            "UPDATE store_meta SET value = value + 1 WHERE key = 'generation'"
+        )
+
+    def close(self):
+        """Refresh planner statistics and close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+                self._conn.close()
+                self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def _init_db(self):
         """Create the database schema if it doesn't exist."""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS file_embeddings (
                     file_path TEXT UNIQUE NOT NULL,
@@ -46,26 +222,72 @@ class EmbeddingStore:
                     content_summary TEXT,
                     embedding BLOB NOT NULL,
                     embedding_dim INTEGER NOT NULL,
+                    embedding_dtype TEXT NOT NULL DEFAULT 'float32',
+                    embedding_scale REAL,
                     file_hash TEXT,
-                    file_modified TIMESTAMP,
-                    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    file_modified INTEGER,
+                    indexed_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                 )
             """)
+
+            # Databases created before quantized storage hold float32 BLOBs
+            columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(file_embeddings)")
+            }
+            if "embedding_dtype" not in columns:
+                conn.execute(
+                    "ALTER TABLE file_embeddings "
+                    "ADD COLUMN embedding_dtype TEXT NOT NULL DEFAULT 'float32'"
+                )
+            if "embedding_scale" not in columns:
+                conn.execute(
+                    "ALTER TABLE file_embeddings ADD COLUMN embedding_scale REAL"
+                )
+
+            # UNIQUE(file_path) already has an implicit index; the covering
+            # (file_path, file_hash) index answers is_indexed() from the B-tree
+            conn.execute("DROP INDEX IF EXISTS idx_file_path")
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_file_path
-                ON file_embeddings(file_path)
+                CREATE INDEX IF NOT EXISTS idx_path_hash
+                ON file_embeddings(file_path, file_hash)
             """)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_content_type
                 ON file_embeddings(content_type)
             """)
-            conn.commit()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO store_meta (key, value) VALUES ('generation', 0)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO store_meta (key, value) VALUES ('store_id', ?)",
+                (uuid.uuid4().hex,)
+            )
+
+            # Timestamps used to be stored as local-time ISO strings;
+            # rewrite them as UNIX epoch seconds
+            migrated = 0
+            for column in ("file_modified", "indexed_at"):
+                migrated += conn.execute(f"""
+                    UPDATE file_embeddings
+                    SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                    WHERE typeof({column}) = 'text'
+                """).rowcount
+            if migrated:
+                self._mark_modified(conn)
+
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     def save_embedding(
         self,
         file_path: str,
         file_name: str,
-        embedding: np.ndarray,
+        embedding: "np.ndarray",
         content_type: str = None,
         summary: str = None,
         file_hash: str = None,
@@ -74,6 +296,9 @@ class EmbeddingStore:
         """
         Save or update an embedding for a file.
 
+        The embedding is L2-normalized and then encoded with the
+        store's storage_dtype.
+
         Args:
             file_path: Absolute path to the file
             file_name: File name
@@ -83,29 +308,90 @@ class EmbeddingStore:
             file_hash: Hash to detect changes
             file_modified: File modification timestamp
         """
-        embedding_bytes = embedding.astype(np.float32).tobytes()
-        embedding_dim = len(embedding)
+        row = self._make_rows([{
+            "file_path": file_path,
+            "file_name": file_name,
+            "embedding": embedding,
+            "content_type": content_type,
+            "summary": summary,
+            "file_hash": file_hash,
+            "file_modified": file_modified,
+        }])[0]
+
+        with self._transaction() as conn:
+            conn.execute(_UPSERT_SQL, row)
+            self._mark_modified(conn)
+
+    def add_embeddings_bulk(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Save or update many embeddings in a single transaction.
 
-        with sqlite3.connect(str(self.db_path)) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO file_embeddings
-                (file_path, file_name, content_type, content_summary,
-                 embedding, embedding_dim, file_hash, file_modified, indexed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                file_path,
-                file_name,
-                content_type,
-                summary,
-                embedding_bytes,
-                embedding_dim,
-                file_hash,
-                file_modified.isoformat() if file_modified else None,
-                datetime.now().isoformat()
+        Each item is a dict with the same keys as save_embedding()'s
+        arguments. The batch is normalized and encoded as one matrix,
+        then written with one executemany() inside one
+        BEGIN IMMEDIATE ... COMMIT, so it costs a single journal sync
+        instead of one per file.
+
+        Args:
+            items: Iterable of embedding dicts
+
+        Returns:
+            Number of rows written
+        """
+        items = list(items)
+        if not items:
+            return 0
+
+        rows = self._make_rows(items)
+
+        self._executemany(_UPSERT_SQL, rows)
+
+        # Give the planner real selectivity for idx_content_type once a
+        # large load has landed; close() keeps it fresh with PRAGMA optimize
+        self._rows_since_analyze += len(rows)
+        if self._rows_since_analyze >= ANALYZE_THRESHOLD:
+            self._exec("ANALYZE file_embeddings")
+            self._rows_since_analyze = 0
+
+        return len(rows)
+
+    def _make_rows(self, items: List[Dict[str, Any]]) -> List[Tuple]:
+        """
+        Build file_embeddings parameter tuples for a batch of embedding dicts.
+
+        All embeddings in the batch must share one dimension; they are
+        stacked into a single matrix so normalization and encoding run as
+        whole-array operations rather than once per vector.
+        """
+        import numpy as np
+
+        matrix = np.stack([
+            np.asarray(item["embedding"], dtype=np.float32) for item in items
+        ])
+        _normalize_rows(matrix)
+        blobs, scales = _encode_rows(matrix, self.storage_dtype)
+        dim = matrix.shape[1]
+        indexed_at = int(time.time())
+
+        rows = []
+        for item, blob, scale in zip(items, blobs, scales):
+            file_modified = item.get("file_modified")
+            rows.append((
+                item["file_path"],
+                item["file_name"],
+                item.get("content_type"),
+                item.get("summary"),
+                blob,
+                dim,
+                self.storage_dtype,
+                scale,
+                item.get("file_hash"),
+                int(file_modified.timestamp()) if file_modified else None,
+                indexed_at
             ))
-            conn.commit()
+        return rows
 
-    def get_embedding(self, file_path: str) -> Optional[np.ndarray]:
+    def get_embedding(self, file_path: str) -> Optional["np.ndarray"]:
         """
         Get the embedding for a specific file.
 
@@ -113,23 +399,23 @@ class EmbeddingStore:
             file_path: Absolute path to the file
 
         Returns:
-            numpy array or None if not indexed
+            float32 numpy array (read-only for float32 rows) or None if
+            not indexed
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            row = conn.execute(
-                "SELECT embedding, embedding_dim FROM file_embeddings WHERE file_path = ?",
-                (file_path,)
-            ).fetchone()
+        row = self._exec(
+            """SELECT embedding, embedding_dtype, embedding_scale
+               FROM file_embeddings WHERE file_path = ?""",
+            (file_path,)
+        ).fetchone()
 
         if row is None:
             return None
 
-        embedding_bytes, dim = row
-        return np.frombuffer(embedding_bytes, dtype=np.float32).copy()
+        return _decode_vector(*row)
 
     def get_all_embeddings(
         self, content_type: str = None
-    ) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    ) -> Tuple[List[Dict[str, Any]], "np.ndarray"]:
         """
         Get all stored embeddings, optionally filtered by content type.
 
@@ -138,40 +424,276 @@ class EmbeddingStore:
 
         Returns:
             Tuple of (file_metadata_list, embeddings_matrix)
-            where embeddings_matrix is shape (N, dim)
+            where embeddings_matrix is shape (N, dim) with unit-length
+            float16 rows
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
+        import numpy as np
+
+        with self._transaction("DEFERRED") as conn:
+            matrix, rowids = self._load_snapshot(conn)
+
             if content_type:
                 rows = conn.execute(
-                    """SELECT file_path, file_name, content_type, content_summary,
-                              embedding, embedding_dim
-                       FROM file_embeddings WHERE content_type = ?""",
+                    """SELECT rowid, file_path, file_name, content_type, content_summary
+                       FROM file_embeddings WHERE content_type = ?
+                       ORDER BY rowid""",
                     (content_type,)
                 ).fetchall()
             else:
                 rows = conn.execute(
-                    """SELECT file_path, file_name, content_type, content_summary,
-                              embedding, embedding_dim
-                       FROM file_embeddings"""
+                    """SELECT rowid, file_path, file_name, content_type, content_summary
+                       FROM file_embeddings ORDER BY rowid"""
                 ).fetchall()
 
         if not rows:
             return [], np.array([], dtype=np.float32)
 
-        metadata = []
-        embeddings = []
+        metadata = [
+            {
+                "file_path": file_path,
+                "file_name": file_name,
+                "content_type": ctype,
+                "content_summary": summary,
+            }
+            for _, file_path, file_name, ctype, summary in rows
+        ]
+
+        if not content_type:
+            # Snapshot rows are in rowid order, same as the metadata
+            return metadata, matrix
+
+        positions = np.searchsorted(rowids, [row[0] for row in rows])
+        return metadata, matrix[positions]
+
+    def search(
+        self,
+        query: "np.ndarray",
+        k: int = 10,
+        content_type: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the k stored files most similar to a query embedding.
+
+        Stored rows are unit length, so cosine similarity is an inner
+        product. Unfiltered searches use a faiss index when faiss is
+        installed (approximate HNSW from HNSW_MIN_ROWS vectors on);
+        otherwise, and for content_type filters, scores come from one
+        exact matrix @ query product over the snapshot.
+
+        Args:
+            query: Query embedding of shape (dim,)
+            k: Number of results to return
+            content_type: Optional content type filter
+
+        Returns:
+            File metadata dicts with a "score" key, highest score first
+        """
+        import numpy as np
+
+        if k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
 
-        for file_path, file_name, ctype, summary, emb_bytes, dim in rows:
-            metadata.append({
+        if not content_type and _import_faiss() is not None:
+            return self._search_faiss(query, k)
+
+        metadata, matrix = self.get_all_embeddings(content_type)
+        if not metadata:
+            return []
+
+        scores = _score_rows(matrix, query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [{**metadata[i], "score": float(scores[i])} for i in top]
+
+    def _search_faiss(self, query: "np.ndarray", k: int) -> List[Dict[str, Any]]:
+        """Top-k search over the whole store with a faiss inner-product index."""
+        with self._transaction("DEFERRED") as conn:
+            matrix, _ = self._load_snapshot(conn)
+            if len(matrix) == 0:
+                return []
+
+            index = self._load_faiss_index(self._snapshot[0], matrix)
+            rows = conn.execute(
+                """SELECT file_path, file_name, content_type, content_summary
+                   FROM file_embeddings ORDER BY rowid"""
+            ).fetchall()
+
+        k = min(k, len(rows))
+        if hasattr(index, "hnsw"):
+            # The beam must be at least as wide as the result list
+            index.hnsw.efSearch = max(HNSW_EF_SEARCH, k)
+        scores, positions = index.search(query.reshape(1, -1), k)
+
+        results = []
+        for score, position in zip(scores[0], positions[0]):
+            if position < 0:
+                continue
+            file_path, file_name, ctype, summary = rows[position]
+            results.append({
                 "file_path": file_path,
                 "file_name": file_name,
                 "content_type": ctype,
                 "content_summary": summary,
+                "score": float(score),
             })
-            emb = np.frombuffer(emb_bytes, dtype=np.float32).copy()
-            embeddings.append(emb)
+        return results
+
+    def _load_faiss_index(self, tag: str, matrix: "np.ndarray") -> "faiss.Index":
+        """
+        Get the faiss index for a snapshot, loading or building it as needed.
 
-        return metadata, np.stack(embeddings)
+        Stores of HNSW_MIN_ROWS vectors or more get an HNSW graph over
+        8-bit quantized vectors, smaller ones an exact flat index.
+
+        The index is keyed by the snapshot tag, so any write (which bumps
+        the generation) invalidates it just like the .npy snapshot.
+        """
+        import numpy as np
+
+        if self._faiss_index is not None and self._faiss_index[0] == tag:
+            return self._faiss_index[1]
+
+        faiss = _import_faiss()
+        index_path = self.snapshot_dir / f"{tag}.faiss"
+        index = None
+        if index_path.exists():
+            try:
+                index = faiss.read_index(str(index_path))
+            except RuntimeError:
+                index = None
+
+        if index is None:
+            vectors = np.ascontiguousarray(matrix, dtype=np.float32)
+            if len(matrix) >= HNSW_MIN_ROWS:
+                # Graph vectors are held as 8-bit scalar codes: a quarter
+                # of the memory and bytes per distance of float32
+                index = faiss.IndexHNSWSQ(
+                    matrix.shape[1], faiss.ScalarQuantizer.QT_8bit,
+                    HNSW_M, faiss.METRIC_INNER_PRODUCT
+                )
+                index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+                # Learns the per-dimension ranges the codes span
+                index.train(vectors)
+            else:
+                index = faiss.IndexFlatIP(matrix.shape[1])
+            index.add(vectors)
+            try:
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+                faiss.write_index(index, str(tmp_path))
+                os.replace(tmp_path, index_path)
+            except (OSError, RuntimeError):
+                # Like the snapshot, the persisted index is only a cache
+                pass
+
+        self._faiss_index = (tag, index)
+        return index
+
+    def _load_snapshot(self, conn: sqlite3.Connection) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Get the (matrix, rowids) snapshot for the current generation.
+
+        Reuses the in-process copy or memory-maps the on-disk .npy files
+        when they match the current generation; otherwise rebuilds them
+        from the BLOB column. Must be called inside a transaction so the
+        generation and the rows read agree.
+
+        Returns:
+            Tuple of (float16 matrix of shape (N, dim), int64 rowids of shape (N,))
+        """
+        import numpy as np
+
+        meta = dict(conn.execute("SELECT key, value FROM store_meta").fetchall())
+        tag = f"{meta['store_id']}-{meta['generation']}"
+
+        if self._snapshot is not None and self._snapshot[0] == tag:
+            return self._snapshot[1], self._snapshot[2]
+
+        vectors_path = self.snapshot_dir / f"{tag}.vectors.npy"
+        rowids_path = self.snapshot_dir / f"{tag}.rowids.npy"
+
+        if vectors_path.exists() and rowids_path.exists():
+            matrix = np.load(vectors_path, mmap_mode="r")
+            rowids = np.load(rowids_path)
+        else:
+            matrix, rowids = self._build_snapshot(conn)
+            self._write_snapshot(tag, vectors_path, rowids_path, matrix, rowids)
+
+        self._snapshot = (tag, matrix, rowids)
+        return matrix, rowids
+
+    @staticmethod
+    def _build_snapshot(conn: sqlite3.Connection) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Decode every stored BLOB into one float16 matrix, ordered by rowid.
+
+        The matrix is sized up front and the cursor is consumed row by row,
+        so only one BLOB is alive as a Python bytes object at a time. Each
+        row is decoded and normalized in float32 before it is narrowed.
+        """
+        import numpy as np
+
+        count, dim = conn.execute(
+            "SELECT COUNT(*), MAX(embedding_dim) FROM file_embeddings"
+        ).fetchone()
+
+        if not count:
+            return np.empty((0, 0), dtype=SNAPSHOT_DTYPE), np.empty(0, dtype=np.int64)
+
+        # One destination allocation; each BLOB is decoded straight into its row
+        matrix = np.empty((count, dim), dtype=SNAPSHOT_DTYPE)
+        rowids = np.empty(count, dtype=np.int64)
+        row = np.empty(dim, dtype=np.float32)
+        cursor = conn.execute(
+            """SELECT rowid, embedding, embedding_dtype, embedding_scale
+               FROM file_embeddings ORDER BY rowid"""
+        )
+        for i, (rowid, emb_bytes, dtype, scale) in enumerate(cursor):
+            rowids[i] = rowid
+            row[:] = np.frombuffer(emb_bytes, dtype=dtype)
+            if scale is not None:
+                row *= scale
+
+            # Rows written before insert-time normalization may not be unit length
+            norm = np.linalg.norm(row)
+            if norm > 0:
+                row /= norm
+            matrix[i] = row
+
+        return matrix, rowids
+
+    def _write_snapshot(
+        self,
+        tag: str,
+        vectors_path: Path,
+        rowids_path: Path,
+        matrix: "np.ndarray",
+        rowids: "np.ndarray"
+    ):
+        """Persist a snapshot atomically and drop files of older generations."""
+        import numpy as np
+
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            for path, array in ((rowids_path, rowids), (vectors_path, matrix)):
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    np.save(f, array)
+                os.replace(tmp_path, path)
+
+            for old in self.snapshot_dir.iterdir():
+                if old.suffix in (".npy", ".faiss") and not old.name.startswith(f"{tag}."):
+                    old.unlink(missing_ok=True)
+        except OSError:
+            # The snapshot is only a cache; the in-memory copy still works
+            pass
 
     def is_indexed(self, file_path: str, file_hash: str = None) -> bool:
         """
@@ -184,65 +706,121 @@ class EmbeddingStore:
         Returns:
             True if file is indexed (and hash matches if provided)
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            if file_hash:
-                row = conn.execute(
-                    "SELECT 1 FROM file_embeddings WHERE file_path = ? AND file_hash = ?",
-                    (file_path, file_hash)
-                ).fetchone()
-            else:
-                row = conn.execute(
-                    "SELECT 1 FROM file_embeddings WHERE file_path = ?",
-                    (file_path,)
-                ).fetchone()
+        if file_hash:
+            row = self._exec(
+                """SELECT EXISTS(SELECT 1 FROM file_embeddings
+                                 WHERE file_path = ? AND file_hash = ?)""",
+                (file_path, file_hash)
+            ).fetchone()
+        else:
+            row = self._exec(
+                "SELECT EXISTS(SELECT 1 FROM file_embeddings WHERE file_path = ?)",
+                (file_path,)
+            ).fetchone()
+
+        return bool(row[0])
+
+    def get_file_hashes(
+        self, path_prefixes: Optional[Iterable[str]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Get the stored hash of indexed files.
+
+        Each prefix is read as one range scan of the covering
+        (file_path, file_hash) index, so callers checking many files avoid
+        one is_indexed() query each.
 
-        return row is not None
+        Args:
+            path_prefixes: Only return files whose path starts with one of
+                these (e.g. the directories being scanned); all files
+                when None
+
+        Returns:
+            Dictionary of file path -> file hash (None if stored without one)
+        """
+        if path_prefixes is None:
+            return dict(self._exec(
+                "SELECT file_path, file_hash FROM file_embeddings"
+            ).fetchall())
+
+        hashes = {}
+        for prefix in path_prefixes:
+            if not prefix:
+                continue
+            # [prefix, prefix with its last character incremented) is
+            # exactly the strings starting with prefix, and unlike LIKE
+            # needs no escaping of '%' and '_' in paths
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            hashes.update(self._exec(
+                """SELECT file_path, file_hash FROM file_embeddings
+                   WHERE file_path >= ? AND file_path < ?""",
+                (prefix, upper)
+            ).fetchall())
+        return hashes
 
     def remove_stale(self, existing_paths: set):
         """
         Remove entries for files that no longer exist.
 
+        The paths to keep are loaded into a TEMP table and stale rows
+        are removed with one anti-join DELETE.
+
         Args:
             existing_paths: Set of file paths that currently exist
-        """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            all_paths = conn.execute(
-                "SELECT file_path FROM file_embeddings"
-            ).fetchall()
 
-            stale_paths = [
-                row[0] for row in all_paths
-                if row[0] not in existing_paths
-            ]
-
-            if stale_paths:
+        Returns:
+            Number of entries removed
+        """
+        with self._transaction() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_paths (path TEXT PRIMARY KEY)")
+            try:
                 conn.executemany(
-                    "DELETE FROM file_embeddings WHERE file_path = ?",
-                    [(p,) for p in stale_paths]
+                    "INSERT OR IGNORE INTO keep_paths (path) VALUES (?)",
+                    ((p,) for p in existing_paths)
                 )
-                conn.commit()
+                removed = conn.execute(
+                    """DELETE FROM file_embeddings
+                       WHERE file_path NOT IN (SELECT path FROM keep_paths)"""
+                ).rowcount
+            finally:
+                conn.execute("DROP TABLE temp.keep_paths")
 
-        return len(stale_paths) if 'stale_paths' in dir() else 0
+            if removed:
+                self._mark_modified(conn)
+
+        return removed
 
     def get_stats(self) -> Dict[str, Any]:
         """
         Get index statistics.
 
+        Row statistics come from a single GROUP BY scan and are cached
+        until the next write bumps the generation.
+
         Returns:
             Dictionary with count, size, last indexed time, type breakdown
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            count = conn.execute(
-                "SELECT COUNT(*) FROM file_embeddings"
+        with self._transaction("DEFERRED") as conn:
+            generation = conn.execute(
+                "SELECT value FROM store_meta WHERE key = 'generation'"
             ).fetchone()[0]
 
-            last_indexed = conn.execute(
-                "SELECT MAX(indexed_at) FROM file_embeddings"
-            ).fetchone()[0]
+            if self._stats is None or self._stats[0] != generation:
+                groups = conn.execute(
+                    """SELECT content_type, COUNT(*), MAX(indexed_at)
+                       FROM file_embeddings GROUP BY content_type"""
+                ).fetchall()
+                self._stats = (
+                    generation,
+                    sum(c for _, c, _ in groups),
+                    max((last for _, _, last in groups if last is not None), default=None),
+                    {t: c for t, c, _ in groups},
+                )
 
-            type_counts = conn.execute(
-                "SELECT content_type, COUNT(*) FROM file_embeddings GROUP BY content_type"
-            ).fetchall()
+            _, count, last_indexed, type_counts = self._stats
+
+        if last_indexed is not None:
+            last_indexed = datetime.fromtimestamp(last_indexed)
 
         db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
 
@@ -251,14 +829,14 @@ class EmbeddingStore:
             "database_size_bytes": db_size,
             "database_size_human": self._format_size(db_size),
             "last_indexed": last_indexed,
-            "type_breakdown": {t: c for t, c in type_counts},
+            "type_breakdown": dict(type_counts),
         }
 
     def clear(self):
         """Remove all entries from the store."""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._transaction() as conn:
             conn.execute("DELETE FROM file_embeddings")
-            conn.commit()
+            self._mark_modified(conn)
 
     @staticmethod
     def _format_size(size_bytes: int) -> str:
@@ -268,3 +846,106 @@ class EmbeddingStore:
                 return f"{size_bytes:.1f} {unit}"
             size_bytes /= 1024.0
         return f"{size_bytes:.1f} TB"
+
+
+# ===== Module-level store =====
+
+_store: Optional[EmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> EmbeddingStore:
+    """
+    Get the process-wide store for the default database.
+
+    Reusing one store keeps its connection, memory-mapped snapshot and
+    faiss index across queries; each search still checks the generation,
+    so writes from other processes are picked up.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+        return _store
+
+
+# ===== Vector Encoding =====
+
+def _normalize_rows(matrix: "np.ndarray"):
+    """L2-normalize each row of a float32 matrix in place; zero rows are left as is."""
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+
+def _score_rows(matrix: "np.ndarray", query: "np.ndarray") -> "np.ndarray":
+    """
+    Compute matrix @ query in float32.
+
+    A float16 matrix is upcast SCORE_BLOCK_ROWS rows at a time, so BLAS
+    runs on float32 without materializing a full float32 copy.
+    """
+    import numpy as np
+
+    if matrix.dtype == np.float32:
+        return matrix @ query
+
+    scores = np.empty(len(matrix), dtype=np.float32)
+    for start in range(0, len(matrix), SCORE_BLOCK_ROWS):
+        block = matrix[start:start + SCORE_BLOCK_ROWS]
+        scores[start:start + len(block)] = block.astype(np.float32) @ query
+    return scores
+
+
+def _encode_rows(
+    matrix: "np.ndarray", dtype: str
+) -> Tuple[List[bytes], List[Optional[float]]]:
+    """
+    Encode the rows of a float32 matrix for storage.
+
+    Args:
+        matrix: float32 matrix of shape (N, dim), rows already L2-normalized
+        dtype: One of STORAGE_DTYPES
+
+    Returns:
+        Tuple of (blobs, scales); scales are None unless dtype is "int8"
+    """
+    import numpy as np
+
+    if dtype == "int8":
+        peaks = np.max(np.abs(matrix), axis=1)
+        scales = np.where(peaks > 0, peaks / 127.0, 1.0)
+        encoded = np.round(matrix / scales[:, None]).astype(np.int8)
+        scale_list = scales.tolist()
+    else:
+        encoded = matrix.astype(dtype, copy=False)
+        scale_list = [None] * len(matrix)
+
+    return [row.tobytes() for row in encoded], scale_list
+
+
+def _decode_vector(blob: bytes, dtype: str, scale: Optional[float]) -> "np.ndarray":
+    """Decode a stored BLOB back into a float32 vector."""
+    import numpy as np
+
+    vector = np.frombuffer(blob, dtype=dtype)
+    if dtype == "float32":
+        # A view over the bytes object; it owns the buffer so no copy is needed
+        return vector
+
+    vector = vector.astype(np.float32)
+    if scale is not None:
+        vector *= scale
+    return vector
+
+
+@lru_cache(maxsize=None)
+def _import_faiss():
+    """Import faiss on first use; None when it is not installed."""
+    try:
+        import faiss
+    except ImportError:
+        # Optional: search() falls back to a NumPy matrix-vector product
+        return None
+    return faiss
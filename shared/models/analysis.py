@@ -195,6 +195,24 @@ class ImageAnalysis(BaseModel):
         Returns:
             Summary string combining key information
         """
+        return self.organizational_summary
+
+    def to_short_summary(self) -> str:
+        """
+        Get a brief one-line summary.
+
+        Returns:
+            Short summary string
+        """
+        return self.short_summary
+
+    # Plain properties rather than cached ones: model_copy(update=...)
+    # copies the instance __dict__, so a cached string would survive a
+    # change to the fields it was built from
+
+    @property
+    def organizational_summary(self) -> str:
+        """Summary string combining scene, month, and location."""
         parts = []
 
         # Add what
@@ -212,13 +230,9 @@ class ImageAnalysis(BaseModel):
 
         return " / ".join(parts)
 
-    def to_short_summary(self) -> str:
-        """
-        Get a brief one-line summary.
-
-        Returns:
-            Short summary string
-        """
+    @property
+    def short_summary(self) -> str:
+        """One-line summary with date, scene type, and location."""
         date_str = self.get_primary_date().strftime("%Y-%m-%d")
         location_str = self.get_primary_location() or "unknown location"
         return f"{date_str} - {self.scene_type or 'image'} at {location_str}"
@@ -64,6 +64,12 @@ class FileMetadata(BaseModel):
         examples=["text", "image", "document", "video", "audio", "archive", "code", "unknown"]
     )
 
+    category: Optional[str] = Field(
+        None,
+        description="Organizer category, set from the extension at scan time",
+        examples=["image", "text", "document", "other"]
+    )
+
     # Optional metadata
     mime_type: Optional[str] = Field(
         None,
@@ -148,6 +154,7 @@ class FileMetadata(BaseModel):
                 "created_date": "2025-11-15T10:30:00",
                 "content_preview": "Invoice #12345\nDate: November 15, 2025...",
                 "content_type": "document",
+                "category": "document",
                 "mime_type": "application/pdf",
                 "parent_directory": "Documents",
                 "hash": "5d41402abc4b2a76b9719d911017c592"
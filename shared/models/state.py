@@ -35,10 +35,19 @@ class OrganizerState(TypedDict):
     recursive: Optional[bool]
     """Whether to scan directories recursively (default: True)"""
 
+    vision_batch_size: Optional[int]
+    """Images kept in flight through the vision model at once (default: 8)"""
+
+    llm_parallel: Optional[int]
+    """Concurrent LLM requests for text analysis (default: 4)"""
+
     # ===== PROCESSING DATA =====
     file_paths: Optional[List[str]]
     """List of all file paths found during scanning"""
 
+    file_stats: Optional[Dict[str, Any]]
+    """Path -> FileStat (size, mtime, ctime) taken during scanning"""
+
     files: List[FileMetadata]
     """List of analyzed file metadata objects"""
 
@@ -116,6 +125,8 @@ def create_initial_state(
     llm_model: Optional[str] = None,
     max_content_preview: int = 1000,
     recursive: bool = True,
+    vision_batch_size: int = 8,
+    llm_parallel: int = 4,
     dry_run: bool = False,
     use_copy: bool = False,
     output_dir: Optional[str] = None
@@ -129,6 +140,8 @@ def create_initial_state(
         llm_model: Specific model name (optional)
         max_content_preview: Max chars for content preview
         recursive: Whether to scan directories recursively
+        vision_batch_size: Images kept in flight through the vision model
+        llm_parallel: Concurrent LLM requests for text analysis
         dry_run: Preview only, don't move files
         use_copy: Copy files instead of moving
         output_dir: Custom output directory
@@ -145,9 +158,12 @@ def create_initial_state(
         llm_model=llm_model,
         max_content_preview=max_content_preview,
         recursive=recursive,
+        vision_batch_size=vision_batch_size,
+        llm_parallel=llm_parallel,
 
         # Processing data (empty initially)
         file_paths=None,
+        file_stats=None,
         files=[],
 
         # Classified files (None initially)
@@ -0,0 +1,130 @@
+"""
+Async Ollama Client
+Runs many /api/generate requests concurrently from one event loop.
+
+With the optional httpx package, requests share one AsyncClient and are
+multiplexed on the event loop, so hundreds of prompts need no thread per
+in-flight call. Without it, the same interface runs blocking requests
+calls on worker threads through a pooled session.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from shared.providers.http import create_session
+from shared.utils import fast_json
+
+try:
+    import httpx
+except ImportError:
+    # Optional: fall back to requests on worker threads
+    httpx = None
+
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+
+# Requests in flight at once; the server only overlaps them up to its
+# own OLLAMA_NUM_PARALLEL
+DEFAULT_CONCURRENCY = 8
+
+DEFAULT_TIMEOUT = 30.0
+
+
+async def generate_many(
+    prompts: List[str],
+    model: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    base_url: str = DEFAULT_BASE_URL,
+    options: Optional[Dict[str, Any]] = None,
+    format: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT
+) -> List[Optional[str]]:
+    """
+    Generate a completion for each prompt.
+
+    Args:
+        prompts: Prompts to send
+        model: Ollama model name
+        concurrency: Maximum requests in flight
+        base_url: Ollama API base URL
+        options: Generation options sent with every request
+        format: Output format constraint (e.g. "json")
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Response text per prompt, in prompt order; None where the request
+        failed or the server returned an error
+    """
+    if not prompts:
+        return []
+
+    payloads = [_build_payload(prompt, model, options, format) for prompt in prompts]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    if httpx is not None:
+        limits = httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency
+        )
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=timeout
+        ) as client:
+
+            async def generate(payload: Dict[str, Any]) -> Optional[str]:
+                async with semaphore:
+                    try:
+                        response = await client.post("/api/generate", json=payload)
+                    except httpx.HTTPError:
+                        return None
+                return _response_text(response.status_code, response.content)
+
+            return await asyncio.gather(*(generate(p) for p in payloads))
+
+    session = create_session(pool_maxsize=concurrency)
+    try:
+
+        async def generate(payload: Dict[str, Any]) -> Optional[str]:
+            async with semaphore:
+                try:
+                    response = await asyncio.to_thread(
+                        session.post,
+                        f"{base_url}/api/generate",
+                        json=payload,
+                        timeout=timeout
+                    )
+                except requests.RequestException:
+                    return None
+            return _response_text(response.status_code, response.content)
+
+        return await asyncio.gather(*(generate(p) for p in payloads))
+    finally:
+        session.close()
+
+
+# ===== Helper Functions =====
+
+def _build_payload(
+    prompt: str,
+    model: str,
+    options: Optional[Dict[str, Any]],
+    format: Optional[str]
+) -> Dict[str, Any]:
+    """Build the /api/generate request body for one prompt."""
+    payload = {"model": model, "prompt": prompt, "stream": False}
+    if format:
+        payload["format"] = format
+    if options:
+        payload["options"] = options
+    return payload
+
+
+def _response_text(status_code: int, content: bytes) -> Optional[str]:
+    """Extract the generated text from an /api/generate response body."""
+    if status_code != 200:
+        return None
+    try:
+        return fast_json.loads(content).get("response", "")
+    except fast_json.JSONDecodeError:
+        return None
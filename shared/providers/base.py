@@ -6,11 +6,57 @@ This provider builds prompts that include rich content analysis
 (image descriptions, text content, etc.) for intelligent organization.
 """
 
+import io
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from shared.models.file_metadata import FileMetadata
 
 
+# Rules framing the sections of the prompt
+SECTION_RULE = "=" * 60
+SUBSECTION_RULE = "-" * 40
+
+# Fixed closing instruction of every prompt
+_PROMPT_FOOTER = (
+    f"\n{SECTION_RULE}\n"
+    "Generate 2-3 DIFFERENT organization schemes. Be SPECIFIC with folder names.\n"
+    f"{SECTION_RULE}"
+)
+
+# Scene type -> folder name; unknown scenes fall back to str.title()
+_SCENE_TO_FOLDER = {
+    "selfie": "Selfies",
+    "portrait": "Portraits",
+    "group-photo": "Group Photos",
+    "beach": "Beach & Pool",
+    "pool": "Beach & Pool",
+    "city-street": "City & Travel",
+    "travel": "City & Travel",
+    "music": "Music & Events",
+    "event": "Music & Events",
+    "art": "Art & Culture",
+    "sports": "Sports & Fitness",
+    "home-indoor": "Home",
+    "nature": "Nature",
+    "food": "Food",
+    "pet": "Pets",
+}
+
+
+@lru_cache(maxsize=64)
+def _prompt_header(file_count: int) -> str:
+    """Build the opening frame of the prompt; batch sizes repeat, so it is cached."""
+    return (
+        f"{SECTION_RULE}\n"
+        f"ORGANIZE THESE {file_count} FILES\n"
+        f"{SECTION_RULE}\n"
+        "\n"
+        "DETAILED FILE ANALYSIS:\n"
+        f"{SUBSECTION_RULE}\n"
+    )
+
+
 class ProviderNotAvailableError(Exception):
     """Raised when the LLM provider is not accessible."""
     pass
@@ -110,24 +156,27 @@ class BaseLLMProvider(ABC):
         text_analysis = analysis_context.get("text_analysis", [])
         document_analysis = analysis_context.get("document_analysis", [])
 
-        # Create lookup maps by file path
-        image_map = {img.file_path: img for img in image_analysis}
-        text_map = {t.get("file_path", ""): t for t in text_analysis}
-        doc_map = {d.get("file_path", ""): d for d in document_analysis}
+        # One lookup by file path -> (kind, analysis). Filled lowest
+        # precedence first so image analysis wins over text, text over document.
+        lookup = {d.get("file_path", ""): ("document", d) for d in document_analysis}
+        lookup.update((t.get("file_path", ""), ("text", t)) for t in text_analysis)
+        lookup.update((img.file_path, ("image", img)) for img in image_analysis)
+        counts = {"image": 0, "text": 0, "document": 0}
 
-        lines = []
-        lines.append("=" * 60)
-        lines.append(f"ORGANIZE THESE {len(files)} FILES")
-        lines.append("=" * 60)
-        lines.append("")
+        buf = io.StringIO()
+        w = buf.write
+
+        w(_prompt_header(len(files)))
 
         # Detailed per-file analysis
-        lines.append("DETAILED FILE ANALYSIS:")
-        lines.append("-" * 40)
 
         for i, file in enumerate(files, 1):
-            if file.path in image_map:
-                img = image_map[file.path]
+            kind, analysis = lookup.get(file.path, (None, None))
+            if kind is not None:
+                counts[kind] += 1
+
+            if kind == "image":
+                img = analysis
                 desc = img.description or "no description"
                 scene = img.scene_type or "unknown"
                 setting = img.indoor_outdoor or "unknown"
@@ -136,91 +185,71 @@ class BaseLLMProvider(ABC):
                 people = img.people_count if img.people_count else 0
                 location = img.get_primary_location() or "unknown"
 
-                lines.append(f"  {i}. {file.name} [IMAGE]")
-                lines.append(f"     Description: {desc}")
-                lines.append(f"     Scene: {scene} | Setting: {setting} | People: {people}")
-                lines.append(f"     Objects: {objects}")
+                w(f"  {i}. {file.name} [IMAGE]\n")
+                w(f"     Description: {desc}\n")
+                w(f"     Scene: {scene} | Setting: {setting} | People: {people}\n")
+                w(f"     Objects: {objects}\n")
                 if activities != "none":
-                    lines.append(f"     Activities: {activities}")
+                    w(f"     Activities: {activities}\n")
                 if location != "unknown":
-                    lines.append(f"     Location: {location}")
+                    w(f"     Location: {location}\n")
 
-            elif file.path in text_map:
-                t = text_map[file.path]
+            elif kind == "text":
+                t = analysis
                 doc_type = t.get("document_type", "unknown")
                 language = t.get("language")
                 topics = ", ".join(t.get("topics", [])) if t.get("topics") else None
                 summary = t.get("summary")
 
-                lines.append(f"  {i}. {file.name} [TEXT -- {doc_type}]")
+                w(f"  {i}. {file.name} [TEXT -- {doc_type}]\n")
                 if language:
-                    lines.append(f"     Language: {language}")
+                    w(f"     Language: {language}\n")
                 if summary:
-                    lines.append(f"     Summary: {summary}")
+                    w(f"     Summary: {summary}\n")
                 elif file.content_preview:
                     preview = file.content_preview[:150].replace("\n", " ")
-                    lines.append(f"     Preview: {preview}")
+                    w(f"     Preview: {preview}\n")
                 if topics:
-                    lines.append(f"     Topics: {topics}")
+                    w(f"     Topics: {topics}\n")
 
-            elif file.path in doc_map:
-                d = doc_map[file.path]
+            elif kind == "document":
+                d = analysis
                 detailed_type = d.get("detailed_type", file.content_type)
                 size_cat = d.get("size_category", "unknown")
-                lines.append(f"  {i}. {file.name} [DOCUMENT -- {detailed_type}, {size_cat}]")
+                w(f"  {i}. {file.name} [DOCUMENT -- {detailed_type}, {size_cat}]\n")
             else:
-                lines.append(f"  {i}. {file.name} [{file.content_type or 'unknown'}]")
+                w(f"  {i}. {file.name} [{file.content_type or 'unknown'}]\n")
 
-            lines.append("")
+            w("\n")
 
-        # Summary counts
-        n_images = len([f for f in files if f.path in image_map])
-        n_text = len([f for f in files if f.path in text_map])
-        n_docs = len([f for f in files if f.path in doc_map])
+        # Summary counts (tallied in the loop above)
+        n_images = counts["image"]
+        n_text = counts["text"]
+        n_docs = counts["document"]
         n_other = len(files) - n_images - n_text - n_docs
 
-        lines.append("=" * 60)
-        lines.append(f"SUMMARY: {len(files)} files total")
+        w(f"{SECTION_RULE}\n")
+        w(f"SUMMARY: {len(files)} files total\n")
         parts = []
         if n_images: parts.append(f"{n_images} images")
         if n_text: parts.append(f"{n_text} text/code")
         if n_docs: parts.append(f"{n_docs} documents")
         if n_other: parts.append(f"{n_other} other")
-        lines.append(f"  {', '.join(parts)}")
-        lines.append("")
+        w(f"  {', '.join(parts)}\n")
+        w("\n")
 
         # File name checklist
-        lines.append("ALL FILES (every one must appear in every suggestion):")
+        w("ALL FILES (every one must appear in every suggestion):\n")
         for file in files:
-            lines.append(f"  - {file.name}")
+            w(f"  - {file.name}\n")
 
-        lines.append("")
-        lines.append("=" * 60)
-        lines.append(f"Generate 2-3 DIFFERENT organization schemes. Be SPECIFIC with folder names.")
-        lines.append("=" * 60)
+        w(_PROMPT_FOOTER)
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     def _scene_to_folder(self, scene: str) -> str:
         """Map scene type to folder name."""
-        mapping = {
-            "selfie": "Selfies",
-            "portrait": "Portraits",
-            "group-photo": "Group Photos",
-            "beach": "Beach & Pool",
-            "pool": "Beach & Pool",
-            "city-street": "City & Travel",
-            "travel": "City & Travel",
-            "music": "Music & Events",
-            "event": "Music & Events",
-            "art": "Art & Culture",
-            "sports": "Sports & Fitness",
-            "home-indoor": "Home",
-            "nature": "Nature",
-            "food": "Food",
-            "pet": "Pets",
-        }
-        return mapping.get(scene, scene.title())
+        return _SCENE_TO_FOLDER.get(scene) or scene.title()
 
     def validate_response(self, response) -> bool:
         """
@@ -1,12 +1,54 @@
 """
 Ollama Embedding Provider
 Local embedding generation via Ollama using nomic-embed-text.
+
+Embeddings are memoized in an in-process LRU cache keyed by a hash of
+the text, persisted next to the other AI-OS data on close() so repeated
+descriptions and queries skip the model across runs. Cached vectors are
+rows of one contiguous float32 matrix rather than separate arrays.
+
+Large batches are split into sub-batches that are sent concurrently.
+The Ollama server only overlaps them if it is allowed to handle
+parallel requests: set OLLAMA_NUM_PARALLEL (e.g. to the
+max_in_flight used here) in the server's environment. The sub-batch
+size can be tuned with AI_OS_EMBED_BATCH.
+
+Each sub-batch is one request to the batch /api/embed endpoint. Ollama
+servers older than that endpoint get one /api/embeddings request per
+text instead.
 """
 
+import os
+import asyncio
+import hashlib
 import requests
 import numpy as np
+from collections import OrderedDict
+from pathlib import Path
 from typing import List, Optional
 
+from shared.providers.http import create_session, list_installed_models
+from shared.utils import fast_json
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment."""
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+# Texts per /api/embed request and concurrent requests for large batches
+DEFAULT_SUB_BATCH = _env_int("AI_OS_EMBED_BATCH", 32)
+DEFAULT_MAX_IN_FLIGHT = 4
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CACHE_DIR = Path.home() / ".ai_os"
+
+# Rows allocated for the cache matrix before it first grows
+_CACHE_INITIAL_ROWS = 256
+
 
 class OllamaEmbeddingProvider:
     """
@@ -20,7 +62,9 @@ class OllamaEmbeddingProvider:
         self,
         model: str = "nomic-embed-text",
         base_url: str = "http://localhost:11434",
-        timeout: int = 60
+        timeout: int = 60,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_path: Optional[Path] = None
     ):
         """
         Initialize embedding provider.
@@ -29,11 +73,37 @@ class OllamaEmbeddingProvider:
             model: Embedding model name (default: nomic-embed-text)
             base_url: Ollama API base URL
             timeout: Request timeout in seconds
+            cache_size: Maximum cached embeddings (0 disables the cache)
+            cache_path: .npz file the cache is persisted to
+                (default: ~/.ai_os/embedding_cache_<model>.npz)
         """
         self.model = model
         self.base_url = base_url
         self.api_url = f"{base_url}/api/embed"
+        self.legacy_api_url = f"{base_url}/api/embeddings"
         self.timeout = timeout
+        # Set once the server turns out not to have /api/embed
+        self._use_legacy_api = False
+        self._session = create_session()
+
+        safe_model = "".join(c if c.isalnum() else "_" for c in model)
+        self.cache_size = cache_size
+        self.cache_path = cache_path or DEFAULT_CACHE_DIR / f"embedding_cache_{safe_model}.npz"
+        self._cache: Optional[_VectorCache] = None
+        self._cache_dirty = False
+
+    def close(self):
+        """Persist the embedding cache and release pooled HTTP connections."""
+        self._save_cache()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def is_available(self) -> bool:
         """
@@ -43,15 +113,7 @@ class OllamaEmbeddingProvider:
             True if embedding generation is available
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/api/tags",
-                timeout=5
-            )
-            if response.status_code != 200:
-                return False
-
-            models = response.json().get("models", [])
-            model_names = [m.get("name", "") for m in models]
+            model_names = list_installed_models(self._session, self.base_url)
 
             # Check for exact model or partial match
             for name in model_names:
@@ -70,37 +132,196 @@ class OllamaEmbeddingProvider:
             text: Text to embed
 
         Returns:
-            numpy array of shape (dim,) with float32 values
+            Unit-length numpy array of shape (dim,) with float32 values
 
         Raises:
             RuntimeError: If embedding generation fails
         """
-        result = self._call_embed_api([text])
-        return np.array(result[0], dtype=np.float32)
+        return self.embed_batch([text])[0]
 
-    def embed_batch(self, texts: List[str]) -> np.ndarray:
+    def embed_batch(
+        self,
+        texts: List[str],
+        sub_batch: int = DEFAULT_SUB_BATCH,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        dtype: np.dtype = np.float32
+    ) -> np.ndarray:
         """
         Generate embeddings for a batch of texts.
 
+        Texts already in the cache are not sent to the model. Remaining
+        texts are a single request when they fit in sub_batch, otherwise
+        they are split and sent concurrently (see embed_batch_async).
+
         Args:
             texts: List of texts to embed
+            sub_batch: Maximum texts per API request
+            max_in_flight: Maximum concurrent API requests
+            dtype: Output dtype; np.float16 halves the size of the result
+                (normalization happens in float32 before narrowing)
 
         Returns:
-            numpy array of shape (N, dim) with float32 values
+            numpy array of shape (N, dim) with dtype values; rows are
+            L2-normalized, so cosine similarity is a plain dot product
 
         Raises:
             RuntimeError: If embedding generation fails
         """
+        if not texts:
+            return np.array([], dtype=dtype)
+
+        if self.cache_size <= 0:
+            out = self._embed_uncached(texts, sub_batch, max_in_flight)
+            return out.astype(dtype, copy=False)
+
+        cache = self._load_cache()
+        keys = [_text_key(text) for text in texts]
+
+        # Unique texts that still need the model, in first-seen order
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in cache and key not in misses:
+                misses[key] = text
+
+        # Fill the output before inserting misses, which may evict hits
+        hit_rows = [i for i, key in enumerate(keys) if key not in misses]
+        out = None
+        if hit_rows:
+            hits = cache.get([keys[i] for i in hit_rows])
+            out = np.empty((len(texts), hits.shape[1]), dtype=np.float32)
+            out[hit_rows] = hits
+
+        if misses:
+            vectors = self._embed_uncached(list(misses.values()), sub_batch, max_in_flight)
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            miss_index = {key: j for j, key in enumerate(misses)}
+            for i, key in enumerate(keys):
+                if key in miss_index:
+                    out[i] = vectors[miss_index[key]]
+            cache.put(list(misses), vectors)
+            self._cache_dirty = True
+
+        return out.astype(dtype, copy=False)
+
+    def _embed_uncached(
+        self,
+        texts: List[str],
+        sub_batch: int,
+        max_in_flight: int
+    ) -> np.ndarray:
+        """Embed texts with the model, concurrently when they exceed one sub-batch."""
+        if len(texts) <= sub_batch:
+            return _normalize_rows(self._to_matrix(self._call_embed_api(texts)))
+
+        return asyncio.run(self.embed_batch_async(texts, sub_batch, max_in_flight))
+
+    async def embed_batch_async(
+        self,
+        texts: List[str],
+        sub_batch: int = DEFAULT_SUB_BATCH,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ) -> np.ndarray:
+        """
+        Generate embeddings for many texts with bounded concurrent requests.
+
+        Texts are split into slices of sub_batch; at most max_in_flight
+        slices are being embedded at once. Each slice's vectors are
+        written into its rows of one preallocated matrix, so the output
+        keeps the input order.
+
+        Args:
+            texts: List of texts to embed
+            sub_batch: Maximum texts per API request
+            max_in_flight: Maximum concurrent API requests
+
+        Returns:
+            numpy array of shape (N, dim) with float32 values; rows are
+            L2-normalized, so cosine similarity is a plain dot product
+
+        Raises:
+            RuntimeError: If any sub-batch fails
+        """
         if not texts:
             return np.array([], dtype=np.float32)
 
-        result = self._call_embed_api(texts)
-        return np.array(result, dtype=np.float32)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        out: Optional[np.ndarray] = None
+
+        async def embed_slice(start: int):
+            nonlocal out
+            async with semaphore:
+                # requests is blocking; run each call on a worker thread
+                result = await asyncio.to_thread(
+                    self._call_embed_api, texts[start:start + sub_batch]
+                )
+            if out is None:
+                out = np.empty((len(texts), len(result[0])), dtype=np.float32)
+            for offset, vector in enumerate(result):
+                out[start + offset] = vector
+
+        await asyncio.gather(*(
+            embed_slice(start) for start in range(0, len(texts), sub_batch)
+        ))
+        return _normalize_rows(out)
+
+    @staticmethod
+    def _to_matrix(embeddings: List[List[float]]) -> np.ndarray:
+        """
+        Copy parsed embedding lists into one preallocated float32 matrix.
+
+        Filling rows one flat list at a time avoids the intermediate
+        nested-sequence walk np.array() does over a list of lists.
+        """
+        out = np.empty((len(embeddings), len(embeddings[0])), dtype=np.float32)
+        for i, vector in enumerate(embeddings):
+            out[i] = vector
+        return out
+
+    # ===== Embedding Cache =====
+
+    def _load_cache(self) -> "_VectorCache":
+        """Get the LRU cache, reading the persisted copy on first use."""
+        if self._cache is not None:
+            return self._cache
+
+        self._cache = _VectorCache(self.cache_size)
+        try:
+            with np.load(self.cache_path) as data:
+                keys = [key.tobytes() for key in data["keys"]]
+                # Caches written before vectors were normalized hold raw rows
+                vectors = _normalize_rows(data["vectors"].astype(np.float32))
+                self._cache.put(keys, vectors)
+        except (OSError, KeyError, ValueError):
+            # Missing or unreadable cache file; start cold
+            pass
+        return self._cache
+
+    def _save_cache(self):
+        """Write the cache to cache_path if it changed since it was loaded."""
+        if not self._cache or not self._cache_dirty:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            keys, vectors = self._cache.export()
+            keys = np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(-1, 16)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, keys=keys, vectors=vectors)
+            os.replace(tmp_path, self.cache_path)
+            self._cache_dirty = False
+        except (OSError, ValueError):
+            # The cache is an optimization only
+            pass
 
     def _call_embed_api(self, texts: List[str]) -> List[List[float]]:
         """
         Call Ollama's /api/embed endpoint.
 
+        Falls back to _call_legacy_embed_api() when the server does not
+        provide /api/embed.
+
         Args:
             texts: List of texts to embed
 
@@ -110,17 +331,57 @@ class OllamaEmbeddingProvider:
         Raises:
             RuntimeError: If API call fails
         """
-        payload = {
+        if self._use_legacy_api:
+            return self._call_legacy_embed_api(texts)
+
+        response = self._post(self.api_url, {
             "model": self.model,
             "input": texts,
-        }
+        })
+
+        if response.status_code == 404:
+            # Ollama before /api/embed (or a model-not-found error)
+            self._use_legacy_api = True
+            return self._call_legacy_embed_api(texts)
+
+        result = self._parse_response(response)
+        embeddings = result.get("embeddings")
+        if embeddings is None:
+            self._use_legacy_api = True
+            return self._call_legacy_embed_api(texts)
+
+        return embeddings
+
+    def _call_legacy_embed_api(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts one request at a time through /api/embeddings.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors
+
+        Raises:
+            RuntimeError: If any API call fails
+        """
+        embeddings = []
+        for text in texts:
+            response = self._post(self.legacy_api_url, {
+                "model": self.model,
+                "prompt": text,
+            })
+            result = self._parse_response(response)
+            embedding = result.get("embedding")
+            if not embedding:
+                raise RuntimeError(f"No 'embedding' field in response: {result}")
+            embeddings.append(embedding)
+        return embeddings
 
+    def _post(self, url: str, payload: dict) -> requests.Response:
+        """POST a JSON payload, turning transport errors into RuntimeError."""
         try:
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                timeout=self.timeout
-            )
+            return self._session.post(url, json=payload, timeout=self.timeout)
         except requests.Timeout:
             raise RuntimeError(
                 f"Embedding request timed out after {self.timeout}s. "
@@ -129,6 +390,9 @@ class OllamaEmbeddingProvider:
         except requests.RequestException as e:
             raise RuntimeError(f"Ollama connection error: {str(e)}")
 
+    @staticmethod
+    def _parse_response(response: requests.Response) -> dict:
+        """Check the status of an embedding response and parse its JSON body."""
         if response.status_code != 200:
             raise RuntimeError(
                 f"Ollama embed API error (status {response.status_code}): "
@@ -136,12 +400,76 @@ class OllamaEmbeddingProvider:
             )
 
         try:
-            result = response.json()
-        except ValueError:
+            return fast_json.loads(response.content)
+        except fast_json.JSONDecodeError:
             raise RuntimeError(f"Invalid JSON from Ollama: {response.text[:200]}")
 
-        embeddings = result.get("embeddings")
-        if embeddings is None:
-            raise RuntimeError(f"No 'embeddings' field in response: {result}")
 
-        return embeddings
+class _VectorCache:
+    """
+    LRU cache of embeddings stored as rows of one float32 matrix.
+
+    The matrix grows geometrically up to capacity rows; an evicted key's
+    row is reused for the next insert. Lookups for a batch are a single
+    gather from the matrix.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._rows: "OrderedDict[bytes, int]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._rows
+
+    def get(self, keys: List[bytes]) -> np.ndarray:
+        """Return the cached vectors for keys (all present) as an (N, dim) copy."""
+        rows = self._rows
+        for key in keys:
+            rows.move_to_end(key)
+        return self._matrix[[rows[key] for key in keys]]
+
+    def put(self, keys: List[bytes], vectors: np.ndarray):
+        """Insert or overwrite vectors, evicting least recently used keys."""
+        rows = self._rows
+        for key, vector in zip(keys, vectors):
+            row = rows.get(key)
+            if row is not None:
+                rows.move_to_end(key)
+            elif len(rows) < self.capacity:
+                row = len(rows)
+                self._reserve(row + 1, len(vector))
+            else:
+                _, row = rows.popitem(last=False)
+            rows[key] = row
+            self._matrix[row] = vector
+
+    def export(self):
+        """Return (keys, vectors) in LRU order, oldest first."""
+        return list(self._rows), self._matrix[list(self._rows.values())]
+
+    def _reserve(self, n_rows: int, dim: int):
+        """Make room for n_rows, doubling the matrix when it is full."""
+        if self._matrix is None:
+            size = min(self.capacity, max(n_rows, _CACHE_INITIAL_ROWS))
+            self._matrix = np.empty((size, dim), dtype=np.float32)
+        elif n_rows > len(self._matrix):
+            size = min(self.capacity, max(n_rows, 2 * len(self._matrix)))
+            grown = np.empty((size, dim), dtype=np.float32)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a float32 matrix in place; zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _text_key(text: str) -> bytes:
+    """Hash a text into a 16-byte embedding cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
@@ -0,0 +1,107 @@
+"""
+HTTP Session Helpers
+Pooled, keep-alive HTTP sessions shared by the Ollama providers.
+
+Reusing one requests.Session per provider keeps connections to the
+Ollama server open between calls instead of paying connection setup on
+every embed or generate request.
+"""
+
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from shared.utils import fast_json
+
+
+# Seconds an /api/tags model listing is reused before asking the server again
+MODEL_LIST_TTL = 30.0
+
+# base_url -> (monotonic fetch time, installed model names)
+_model_list_cache: Dict[str, Tuple[float, List[str]]] = {}
+_model_list_lock = threading.Lock()
+
+
+def create_session(
+    pool_connections: int = 16,
+    pool_maxsize: int = 32,
+    retries: int = 3
+) -> requests.Session:
+    """
+    Create a requests.Session with a pooled, retrying HTTP adapter.
+
+    Only idempotent GETs (e.g. /api/tags) are retried; POSTs to the
+    model endpoints are never replayed automatically.
+
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Maximum open connections kept per host
+        retries: Retry attempts for failed GET requests
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def list_installed_models(
+    session: requests.Session,
+    base_url: str,
+    ttl: float = MODEL_LIST_TTL
+) -> List[str]:
+    """
+    List the models installed on an Ollama server.
+
+    The listing is cached per server for ttl seconds and shared by every
+    provider, so repeated availability checks don't each hit /api/tags.
+    Failed lookups are not cached.
+
+    Args:
+        session: Session used if the listing has to be fetched
+        base_url: Ollama API base URL
+        ttl: Seconds a cached listing stays valid
+
+    Returns:
+        Installed model names (e.g. "llava:7b")
+
+    Raises:
+        requests.RequestException: If the server cannot be reached
+        RuntimeError: If the server answers with an error status
+    """
+    now = time.monotonic()
+    with _model_list_lock:
+        cached = _model_list_cache.get(base_url)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+
+    response = session.get(f"{base_url}/api/tags", timeout=5)
+    if response.status_code != 200:
+        raise RuntimeError(f"Ollama API error: {response.status_code}")
+
+    models = fast_json.loads(response.content).get("models", [])
+    names = [m.get("name", "") for m in models]
+
+    with _model_list_lock:
+        _model_list_cache[base_url] = (time.monotonic(), names)
+    return names
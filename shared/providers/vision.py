@@ -1,13 +1,37 @@
 """
 Ollama Vision Provider
 Uses LLaVA model for image analysis via Ollama.
+
+Batches of images go through a staged pipeline (load/encode -> POST ->
+parse) so disk and CPU work overlaps with inference. The number of
+concurrent POSTs follows OLLAMA_NUM_PARALLEL, which should match the
+server's own setting.
 """
 
+import os
+import re
 import base64
-import json
-import requests
+import asyncio
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+
+from shared.providers.http import create_session, list_installed_models
+from shared.utils import fast_json
+from shared.utils.fast_io import open_noatime
+
+
+# Longest side of images sent to the vision model. LLaVA resizes to a
+# 336px grid, so anything beyond 2x that is wasted decode and transfer.
+VISION_MAX_SIZE = 672
+
+# Smallest embedded HEIC thumbnail worth using instead of the full image
+HEIC_MIN_THUMBNAIL = 336
+
+# How long Ollama keeps the model loaded after a request
+DEFAULT_KEEP_ALIVE = "10m"
+
+# JSON object inside a markdown code fence, e.g. ```json {...} ```
+_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*\})\s*```', re.S)
 
 
 class OllamaVisionProvider:
@@ -26,7 +50,8 @@ class OllamaVisionProvider:
         self,
         model: str = "llava:7b",
         base_url: str = "http://localhost:11434",
-        timeout: int = 120
+        timeout: int = 120,
+        keep_alive: str = DEFAULT_KEEP_ALIVE
     ):
         """
         Initialize vision provider.
@@ -35,11 +60,27 @@ class OllamaVisionProvider:
             model: Vision model name (default: llava:7b)
             base_url: Ollama API base URL
             timeout: Request timeout in seconds
+            keep_alive: How long Ollama keeps the model resident between
+                requests, so a batch of images never pays a reload
         """
         self.model = model
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.timeout = timeout
+        self.keep_alive = keep_alive
+        self._session = create_session()
+
+    def close(self):
+        """Release pooled HTTP connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def is_available(self) -> bool:
         """
@@ -49,16 +90,7 @@ class OllamaVisionProvider:
             True if vision analysis is available
         """
         try:
-            response = requests.get(
-                f"{self.base_url}/api/tags",
-                timeout=5
-            )
-            if response.status_code != 200:
-                return False
-
-            # Check if llava model is installed
-            models = response.json().get("models", [])
-            model_names = [m.get("name", "") for m in models]
+            model_names = list_installed_models(self._session, self.base_url)
 
             # Check for our model or any llava variant
             for name in model_names:
@@ -88,15 +120,7 @@ class OllamaVisionProvider:
                 'activities': List[str] or None
             }
         """
-        # Default result
-        result = {
-            'description': '',
-            'objects': [],
-            'scene': None,
-            'people_count': None,
-            'indoor_outdoor': None,
-            'activities': None
-        }
+        result = self._empty_result()
 
         try:
             # Read and encode image
@@ -120,10 +144,126 @@ class OllamaVisionProvider:
 
         return result
 
+    def analyze_images(self, image_paths: List[str], concurrency: int = 4) -> List[Dict]:
+        """
+        Analyze many images with overlapping load, inference, and parsing.
+
+        Synchronous wrapper around analyze_images_async().
+
+        Args:
+            image_paths: Paths to image files
+            concurrency: Number of concurrent image loaders
+
+        Returns:
+            One result dict per path (same shape as analyze_image()), in input order
+        """
+        if not image_paths:
+            return []
+        return asyncio.run(self.analyze_images_async(image_paths, concurrency))
+
+    async def analyze_images_async(
+        self,
+        image_paths: List[str],
+        concurrency: int = 4
+    ) -> List[Dict]:
+        """
+        Analyze many images through a bounded three-stage pipeline.
+
+        Stage 1 reads and base64-encodes images on worker threads, stage 2
+        POSTs them to Ollama (OLLAMA_NUM_PARALLEL requests at a time, or
+        `concurrency` if unset), stage 3 parses the responses. Bounded
+        queues between stages provide backpressure so only a few encoded
+        images are held in memory at once.
+
+        Args:
+            image_paths: Paths to image files
+            concurrency: Number of concurrent image loaders
+
+        Returns:
+            One result dict per path (same shape as analyze_image()), in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(image_paths)
+        encoded_queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        response_queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        pending = iter(enumerate(image_paths))
+        prompt = self._build_vision_prompt()
+
+        try:
+            num_parallel = int(os.environ.get("OLLAMA_NUM_PARALLEL", concurrency))
+        except ValueError:
+            num_parallel = concurrency
+        num_parallel = max(1, num_parallel)
+
+        async def load_worker():
+            # Loaders share one iterator, so each path is taken exactly once
+            for index, path in pending:
+                image_data = await asyncio.to_thread(self._encode_image, path)
+                if not image_data:
+                    result = self._empty_result()
+                    result['description'] = f"Could not read image: {Path(path).name}"
+                    results[index] = result
+                    continue
+                await encoded_queue.put((index, image_data))
+
+        async def post_worker():
+            while True:
+                item = await encoded_queue.get()
+                if item is None:
+                    return
+                index, image_data = item
+                try:
+                    response = await asyncio.to_thread(self._call_ollama, prompt, image_data)
+                except Exception as e:
+                    result = self._empty_result()
+                    result['description'] = f"Analysis error: {str(e)}"
+                    results[index] = result
+                    continue
+                await response_queue.put((index, response))
+
+        async def parse_worker():
+            while True:
+                item = await response_queue.get()
+                if item is None:
+                    return
+                index, response = item
+                result = self._empty_result()
+                try:
+                    result.update(self._parse_response(response))
+                except Exception as e:
+                    result['description'] = f"Analysis error: {str(e)}"
+                results[index] = result
+
+        posters = [asyncio.create_task(post_worker()) for _ in range(num_parallel)]
+        parser = asyncio.create_task(parse_worker())
+
+        await asyncio.gather(*(load_worker() for _ in range(concurrency)))
+        for _ in posters:
+            await encoded_queue.put(None)
+        await asyncio.gather(*posters)
+        await response_queue.put(None)
+        await parser
+
+        return results
+
+    @staticmethod
+    def _empty_result() -> Dict:
+        """Default analysis result, used when analysis fails or is partial."""
+        return {
+            'description': '',
+            'objects': [],
+            'scene': None,
+            'people_count': None,
+            'indoor_outdoor': None,
+            'activities': None
+        }
+
     def _encode_image(self, image_path: str) -> Optional[str]:
         """
         Encode image to base64.
 
+        Images larger than VISION_MAX_SIZE are downscaled and re-encoded
+        as JPEG; small JPEG/PNG files are sent as-is.
+
         Args:
             image_path: Path to image
 
@@ -137,15 +277,47 @@ class OllamaVisionProvider:
             if path.suffix.lower() in ['.heic', '.heif']:
                 return self._convert_heic_to_base64(path)
 
-            with open(path, 'rb') as f:
-                return base64.b64encode(f.read()).decode('utf-8')
+            return self._downscale_to_base64(path)
         except Exception:
             return None
 
+    def _downscale_to_base64(self, path: Path) -> str:
+        """
+        Base64-encode an image, downscaling it to VISION_MAX_SIZE first if needed.
+
+        Args:
+            path: Path to a Pillow-readable image
+
+        Returns:
+            Base64 encoded image
+        """
+        from PIL import Image, UnidentifiedImageError
+
+        with open_noatime(path) as f:
+            try:
+                img = Image.open(f)
+            except UnidentifiedImageError:
+                # Not something Pillow can decode (e.g. SVG); send the file itself
+                return _b64encode_file(path)
+
+            with img:
+                if max(img.size) <= VISION_MAX_SIZE and img.format in ('JPEG', 'PNG'):
+                    return _b64encode_file(path)
+
+                # JPEG can decode straight to a reduced scale via DCT scaling
+                img.draft('RGB', (VISION_MAX_SIZE, VISION_MAX_SIZE))
+                img.thumbnail((VISION_MAX_SIZE, VISION_MAX_SIZE), Image.Resampling.BILINEAR)
+                return _jpeg_base64(img, quality=82)
+
     def _convert_heic_to_base64(self, path: Path) -> Optional[str]:
         """
         Convert HEIC image to base64 JPEG.
 
+        LLaVA only sees a small image, so an embedded thumbnail of at
+        least HEIC_MIN_THUMBNAIL pixels is used when the file has one;
+        only files without one pay for a full-resolution decode. The
+        result is downscaled to VISION_MAX_SIZE before JPEG encoding.
+
         Args:
             path: Path to HEIC file
 
@@ -155,24 +327,24 @@ class OllamaVisionProvider:
         try:
             from PIL import Image
             import pillow_heif
-            import io
-
-            # Register HEIF opener
-            pillow_heif.register_heif_opener()
 
-            # Open and convert
-            img = Image.open(path)
+            heif_file = pillow_heif.open_heif(path)
+            primary = heif_file[heif_file.primary_index]
 
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # Smallest embedded thumbnail that is still large enough
+            thumbnails = [
+                (box, index)
+                for index, box in enumerate(primary.info.get("thumbnails", []))
+                if box >= HEIC_MIN_THUMBNAIL
+            ]
+            if thumbnails:
+                img = primary.get_thumbnail(min(thumbnails)[1]).to_pillow()
+            else:
+                img = primary.to_pillow()
 
-            # Save to bytes
-            buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=85)
-            buffer.seek(0)
+            img.thumbnail((VISION_MAX_SIZE, VISION_MAX_SIZE), Image.Resampling.BILINEAR)
 
-            return base64.b64encode(buffer.read()).decode('utf-8')
+            return _jpeg_base64(img, quality=80)
 
         except ImportError:
             # pillow_heif not installed
@@ -219,6 +391,10 @@ Respond ONLY with valid JSON, no other text."""
         """
         Call Ollama API with image.
 
+        The response is streamed and its fragments accumulated; with
+        stream disabled Ollama can buffer the whole generation server-side
+        and stall long after the model has finished.
+
         Args:
             prompt: Text prompt
             image_base64: Base64 encoded image
@@ -230,24 +406,36 @@ Respond ONLY with valid JSON, no other text."""
             "model": self.model,
             "prompt": prompt,
             "images": [image_base64],
-            "stream": False,
+            "stream": True,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": 0.3,
                 "num_predict": 500
             }
         }
 
-        response = requests.post(
+        with self._session.post(
             self.api_url,
             json=payload,
-            timeout=self.timeout
-        )
-
-        if response.status_code != 200:
-            raise Exception(f"Ollama API error: {response.status_code}")
-
-        result = response.json()
-        return result.get("response", "")
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code}")
+
+            # One JSON object per line: {"response": "...", "done": false}
+            fragments = []
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = fast_json.loads(line)
+                if "error" in chunk:
+                    raise Exception(f"Ollama API error: {chunk['error']}")
+                fragments.append(chunk.get("response", ""))
+                if chunk.get("done"):
+                    break
+
+        return "".join(fragments)
 
     def _parse_response(self, response: str) -> Dict:
         """
@@ -271,18 +459,13 @@ Respond ONLY with valid JSON, no other text."""
         # Clean up response
         text = response.strip()
 
-        # Remove markdown code blocks if present
-        if text.startswith("```"):
-            lines = text.split("\n")
-            # Remove first and last lines (``` markers)
-            if lines[0].startswith("```"):
-                lines = lines[1:]
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
-            text = "\n".join(lines)
+        # Unwrap markdown code blocks if present
+        match = _FENCE_RE.search(text)
+        if match:
+            text = match.group(1)
 
         try:
-            data = json.loads(text)
+            data = fast_json.loads(text)
 
             result['description'] = data.get('description', '')
             result['objects'] = data.get('objects', [])
@@ -291,8 +474,68 @@ Respond ONLY with valid JSON, no other text."""
             result['indoor_outdoor'] = data.get('indoor_outdoor')
             result['activities'] = data.get('activities')
 
-        except json.JSONDecodeError:
+        except fast_json.JSONDecodeError:
             # If JSON parsing fails, use the raw text as description
             result['description'] = text[:500] if text else "No description available"
 
         return result
+
+
+# ===== Helper Functions =====
+
+def _jpeg_base64(img, quality: int) -> str:
+    """JPEG-encode a PIL image in memory and return it as base64."""
+    import io
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # optimize=False skips a second Huffman pass
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality, optimize=False)
+    return base64.b64encode(buffer.getbuffer()).decode('ascii')
+
+
+# Read size for streaming base64; a multiple of 3 so no block is padded
+_B64_CHUNK = 57 * 1024
+
+
+def _b64encode_file(path: Path) -> str:
+    """
+    Base64-encode a file without holding its raw bytes in memory.
+
+    The file is read in _B64_CHUNK blocks into one reused buffer and each
+    block's encoding is written into an output buffer preallocated from
+    the file size, so the only full-size copies are the base64 buffer and
+    the returned str.
+    """
+    size = os.path.getsize(path)
+    out = bytearray(((size + 2) // 3) * 4)
+    chunk = bytearray(_B64_CHUNK)
+    view = memoryview(chunk)
+    pos = 0
+
+    # Unbuffered: readinto() goes straight from the kernel into chunk
+    with open_noatime(path, buffering=0) as f:
+        while True:
+            # A raw read may return less than asked (network/FUSE mounts).
+            # Only the final block may be short, or base64 padding would
+            # land mid-stream, so fill the chunk before encoding it
+            n = 0
+            while n < _B64_CHUNK:
+                read = f.readinto(view[n:])
+                if not read:
+                    break
+                n += read
+            if not n:
+                break
+            encoded = base64.b64encode(view[:n])
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+            if n < _B64_CHUNK:
+                break
+
+    if pos != len(out):
+        # File changed size while being read
+        del out[pos:]
+    return out.decode('ascii')
@@ -0,0 +1,167 @@
+"""
+Analysis Cache
+Persistent cache of LLM analysis results keyed by file identity.
+
+Vision and text analysis are by far the slowest steps of the organizer,
+and re-running it on the same folder would otherwise send every file
+through the model again. Results are stored as JSON in a small SQLite
+database under a key derived from the file's path, size and mtime plus
+whatever else the result depends on (model name, content hash), so an
+edited file or a different model is simply a miss.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from shared.utils import fast_json
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".ai_os" / "analysis_cache.db"
+
+
+class AnalysisCache:
+    """
+    SQLite-backed key -> JSON dict cache at ~/.ai_os/analysis_cache.db
+
+    One connection is shared by all threads behind a lock, so nodes can
+    read and write results from worker threads.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Custom path for the database
+                (default: ~/.ai_os/analysis_cache.db)
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                cache_key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from file_cache_key()
+
+        Returns:
+            Cached result dict, or None on a miss
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several cached results at once.
+
+        Args:
+            keys: Cache keys from file_cache_key()
+
+        Returns:
+            Dictionary of key -> result for the keys that were found
+        """
+        keys = [key for key in keys if key]
+        results = {}
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT cache_key, result FROM analysis_cache "
+                    f"WHERE cache_key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, result in rows:
+                    try:
+                        results[key] = fast_json.loads(result)
+                    except fast_json.JSONDecodeError:
+                        continue
+
+        return results
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result.
+
+        Args:
+            key: Cache key from file_cache_key()
+            result: JSON-serializable result dict
+        """
+        self.put_many({key: result})
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]):
+        """
+        Store several results in one transaction.
+
+        Args:
+            items: Dictionary of cache key -> JSON-serializable result dict
+        """
+        now = int(time.time())
+        rows = [
+            (key, json.dumps(result, default=str), now)
+            for key, result in items.items()
+            if key
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO analysis_cache (cache_key, result, created_at) "
+                "VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+
+def file_cache_key(path: str, *parts: str) -> Optional[str]:
+    """
+    Build a cache key for a file that changes whenever the file does.
+
+    Args:
+        path: File path
+        *parts: Extra values the cached result depends on (e.g. model name)
+
+    Returns:
+        Hex key, or None if the file cannot be stat'ed
+    """
+    try:
+        stats = os.stat(path)
+    except OSError:
+        return None
+
+    raw = "|".join((str(path), str(stats.st_size), str(stats.st_mtime_ns), *parts))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
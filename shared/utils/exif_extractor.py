@@ -1,21 +1,65 @@
 """
 EXIF Extractor Utility
-Extracts EXIF metadata from images using piexif and Pillow.
+Extracts EXIF metadata from images using Pillow.
+
+Pillow parses the EXIF block once while reading the image header, so
+tags are read straight from Image.getexif() without re-parsing the raw
+bytes or decoding any pixel data.
 """
 
-import piexif
+import os
+import numpy as np
 from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Any, Optional, Dict, List, Tuple
+
+from shared.utils.fast_io import open_noatime
+from shared.utils.feature_cache import get_feature_cache
+
+
+# Sub-IFD pointers in the primary IFD
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+
+# Tag name -> (sub-IFD pointer or None for the primary IFD, tag ID)
+EXIF_TAGS = {
+    'Make': (None, 0x010F),
+    'Model': (None, 0x0110),
+    'DateTime': (None, 0x0132),
+    'DateTimeOriginal': (EXIF_IFD_POINTER, 0x9003),
+    'DateTimeDigitized': (EXIF_IFD_POINTER, 0x9004),
+    'GPSLatitudeRef': (GPS_IFD_POINTER, 0x0001),
+    'GPSLatitude': (GPS_IFD_POINTER, 0x0002),
+    'GPSLongitudeRef': (GPS_IFD_POINTER, 0x0003),
+    'GPSLongitude': (GPS_IFD_POINTER, 0x0004),
+}
+
+# Raw GPS rationals gathered per image for vectorized degree conversion
+GPS_DTYPE = np.dtype([
+    ('lat_num', 'i8', 3), ('lat_den', 'i8', 3),
+    ('lon_num', 'i8', 3), ('lon_den', 'i8', 3),
+    ('lat_ref', 'S1'), ('lon_ref', 'S1'),
+])
+
+# Threads reading image headers; mostly I/O wait, so more than the core count
+DEFAULT_EXIF_WORKERS = min(32, (os.cpu_count() or 1) + 4)
 
+# Formats Pillow can only open with the optional pillow-heif plugin
+HEIF_EXTENSIONS = {'.heic', '.heif'}
 
-def extract_exif_data(image_path: str) -> Dict:
+
+def extract_exif_data(image_path: str, fast: bool = True) -> Dict:
     """
     Extract EXIF metadata from an image file.
 
     Args:
         image_path: Path to the image file
+        fast: Only parse the image header, never decoding pixels. Pillow's
+            PNG plugin otherwise decodes the whole image to look for an
+            eXIf chunk stored after the image data.
 
     Returns:
         Dictionary containing extracted EXIF data:
@@ -28,6 +72,116 @@ def extract_exif_data(image_path: str) -> Dict:
             'has_exif': bool
         }
     """
+    result, tags = _read_exif(image_path, fast)
+
+    if tags:
+        # Extract GPS location
+        location = _extract_gps_location(tags)
+        if location:
+            result['location'] = location
+
+    return result
+
+
+def extract_exif_batch(
+    paths: List[str],
+    max_workers: int = DEFAULT_EXIF_WORKERS,
+    use_cache: bool = True,
+    fast: bool = True
+) -> List[Dict]:
+    """
+    Extract EXIF metadata from many image files at once.
+
+    Files are opened and parsed in a thread pool; the raw GPS rationals
+    are then converted to decimal degrees in a single NumPy pass instead
+    of one Python-level conversion per coordinate. Results are reused
+    from the on-disk feature cache for files whose mtime and size have
+    not changed.
+
+    Args:
+        paths: Paths to the image files
+        max_workers: Number of threads used to read files
+        use_cache: Consult and update the feature cache
+        fast: Only parse image headers (see extract_exif_data())
+
+    Returns:
+        List of dictionaries in the same order as paths, each with the
+        same keys as extract_exif_data()
+    """
+    if not use_cache:
+        return _extract_exif_uncached(paths, max_workers, fast)
+
+    cache = get_feature_cache()
+    results: List[Optional[Dict]] = [None] * len(paths)
+    stats = {}
+    miss_indices = []
+
+    for i, path in enumerate(paths):
+        try:
+            stats[i] = os.stat(path)
+        except OSError:
+            miss_indices.append(i)
+            continue
+
+        results[i] = cache.get_exif(str(path), stats[i])
+        if results[i] is None:
+            miss_indices.append(i)
+
+    if miss_indices:
+        extracted = _extract_exif_uncached([paths[i] for i in miss_indices], max_workers, fast)
+        for i, result in zip(miss_indices, extracted):
+            results[i] = result
+            # Don't remember files that could not be opened at all
+            if i in stats and result['image_dimensions'] is not None:
+                cache.put_exif(str(paths[i]), stats[i], result)
+        cache.save()
+
+    return results
+
+
+def _extract_exif_uncached(paths: List[str], max_workers: int, fast: bool) -> List[Dict]:
+    """Extract EXIF metadata for paths without consulting the cache."""
+    if not paths:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = list(executor.map(lambda path: _read_exif(path, fast), paths))
+
+    results = [result for result, _ in loaded]
+
+    # Gather raw GPS rationals for the images that have them
+    gps_rows = []
+    gps_indices = []
+    for i, (_, tags) in enumerate(loaded):
+        row = _extract_gps_rationals(tags) if tags else None
+        if row is not None:
+            gps_rows.append(row)
+            gps_indices.append(i)
+
+    if gps_rows:
+        gps = np.array(gps_rows, dtype=GPS_DTYPE)
+        lat = _rationals_to_degrees(gps['lat_num'], gps['lat_den'], gps['lat_ref'], b'S')
+        lon = _rationals_to_degrees(gps['lon_num'], gps['lon_den'], gps['lon_ref'], b'W')
+
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        for i, la, lo, ok in zip(gps_indices, lat.tolist(), lon.tolist(), valid.tolist()):
+            if ok:
+                results[i]['location'] = _format_location(la, lo)
+
+    return results
+
+
+def _read_exif(image_path: str, fast: bool = True) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Open an image and extract everything except the GPS location.
+
+    Args:
+        image_path: Path to the image file
+        fast: Read EXIF from the header only (see extract_exif_data())
+
+    Returns:
+        Tuple of (result dictionary, EXIF tags by name or None)
+    """
     result = {
         'date_taken': None,
         'location': None,
@@ -37,73 +191,85 @@ def extract_exif_data(image_path: str) -> Dict:
         'has_exif': False
     }
 
+    if Path(image_path).suffix.lower() in HEIF_EXTENSIONS:
+        _register_heif_opener()
+
     try:
-        # Open image with Pillow
-        image = Image.open(image_path)
+        # Open image with Pillow; only the header is read, not the pixels
+        with open_noatime(image_path) as f, Image.open(f) as image:
+            # Get dimensions
+            width, height = image.size
+            result['image_dimensions'] = f"{width}x{height}"
 
-        # Get dimensions
-        width, height = image.size
-        result['image_dimensions'] = f"{width}x{height}"
+            # The base implementation reads what the header parse found;
+            # format overrides (PNG) may load() the whole image first
+            exif = Image.Image.getexif(image) if fast else image.getexif()
+            if not exif:
+                # No EXIF data
+                return result, None
 
-        # Try to load EXIF data
-        try:
-            exif_dict = piexif.load(image.info.get('exif', b''))
-        except Exception:
-            # No EXIF data or corrupted
-            return result
-
-        if not exif_dict:
-            return result
+            tags = _collect_tags(exif)
 
         result['has_exif'] = True
 
         # Extract date taken
-        date_taken = _extract_date_taken(exif_dict)
+        date_taken = _extract_date_taken(tags)
         if date_taken:
             result['date_taken'] = date_taken
 
-        # Extract GPS location
-        location = _extract_gps_location(exif_dict)
-        if location:
-            result['location'] = location
-
         # Extract camera info
-        camera_make, camera_model = _extract_camera_info(exif_dict)
+        camera_make, camera_model = _extract_camera_info(tags)
         result['camera_make'] = camera_make
         result['camera_model'] = camera_model
 
+        return result, tags
+
     except Exception as e:
         # If anything fails, return what we have
-        pass
+        return result, None
 
-    return result
 
+def _collect_tags(exif: Image.Exif) -> Dict[str, Any]:
+    """
+    Look up the tags in EXIF_TAGS from a parsed Pillow EXIF block.
+
+    Args:
+        exif: EXIF block from Image.getexif()
+
+    Returns:
+        Dictionary of tag name -> value for the tags that are present
+    """
+    ifds = {None: exif}
+    tags = {}
+
+    for name, (pointer, tag_id) in EXIF_TAGS.items():
+        if pointer not in ifds:
+            try:
+                ifds[pointer] = exif.get_ifd(pointer)
+            except Exception:
+                ifds[pointer] = {}
+
+        value = ifds[pointer].get(tag_id)
+        if value is not None:
+            tags[name] = value
 
-def _extract_date_taken(exif_dict: Dict) -> Optional[datetime]:
+    return tags
+
+
+def _extract_date_taken(tags: Dict[str, Any]) -> Optional[datetime]:
     """
     Extract date/time when photo was taken from EXIF.
 
     Args:
-        exif_dict: EXIF dictionary from piexif
+        tags: EXIF tags by name from _collect_tags()
 
     Returns:
         datetime object or None
     """
-    # Try different EXIF tags for date
-    date_tags = [
-        (piexif.ExifIFD.DateTimeOriginal, "0th"),
-        (piexif.ExifIFD.DateTimeDigitized, "Exif"),
-        (piexif.ImageIFD.DateTime, "0th"),
-    ]
-
-    for tag, ifd_name in date_tags:
+    # Try different EXIF tags for date, most specific first
+    for name in ('DateTimeOriginal', 'DateTimeDigitized', 'DateTime'):
         try:
-            if ifd_name == "0th" and "0th" in exif_dict:
-                date_str = exif_dict["0th"].get(piexif.ImageIFD.DateTime)
-            elif ifd_name == "Exif" and "Exif" in exif_dict:
-                date_str = exif_dict["Exif"].get(tag)
-            else:
-                continue
+            date_str = tags.get(name)
 
             if date_str:
                 # EXIF date format: "YYYY:MM:DD HH:MM:SS"
@@ -111,7 +277,7 @@ def _extract_date_taken(exif_dict: Dict) -> Optional[datetime]:
                     date_str = date_str.decode('utf-8')
 
                 # Parse the date
-                dt = datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                dt = datetime.strptime(date_str.strip('\x00'), "%Y:%m:%d %H:%M:%S")
                 return dt
         except Exception:
             continue
@@ -119,39 +285,31 @@ def _extract_date_taken(exif_dict: Dict) -> Optional[datetime]:
     return None
 
 
-def _extract_gps_location(exif_dict: Dict) -> Optional[str]:
+def _extract_gps_location(tags: Dict[str, Any]) -> Optional[str]:
     """
     Extract GPS coordinates from EXIF and format as string.
 
     Args:
-        exif_dict: EXIF dictionary from piexif
+        tags: EXIF tags by name from _collect_tags()
 
     Returns:
         Location string (e.g., "40.7128N, 74.0060W") or None
     """
-    if "GPS" not in exif_dict:
-        return None
-
-    gps_data = exif_dict["GPS"]
-
     try:
         # Get latitude
         lat = _convert_gps_to_degrees(
-            gps_data.get(piexif.GPSIFD.GPSLatitude),
-            gps_data.get(piexif.GPSIFD.GPSLatitudeRef)
+            tags.get('GPSLatitude'),
+            tags.get('GPSLatitudeRef')
         )
 
         # Get longitude
         lon = _convert_gps_to_degrees(
-            gps_data.get(piexif.GPSIFD.GPSLongitude),
-            gps_data.get(piexif.GPSIFD.GPSLongitudeRef)
+            tags.get('GPSLongitude'),
+            tags.get('GPSLongitudeRef')
         )
 
         if lat is not None and lon is not None:
-            # Format as "40.7128N, 74.0060W"
-            lat_dir = "N" if lat >= 0 else "S"
-            lon_dir = "E" if lon >= 0 else "W"
-            return f"{abs(lat):.4f}{lat_dir}, {abs(lon):.4f}{lon_dir}"
+            return _format_location(lat, lon)
 
     except Exception:
         pass
@@ -161,14 +319,14 @@ def _extract_gps_location(exif_dict: Dict) -> Optional[str]:
 
 def _convert_gps_to_degrees(
     gps_coord: Optional[Tuple],
-    gps_ref: Optional[bytes]
+    gps_ref: Optional[str]
 ) -> Optional[float]:
     """
     Convert GPS coordinates from EXIF format to decimal degrees.
 
     Args:
-        gps_coord: GPS coordinate tuple ((degrees, 1), (minutes, 1), (seconds, 100))
-        gps_ref: Reference (b'N', b'S', b'E', or b'W')
+        gps_coord: Tuple of degree, minute, second rationals
+        gps_ref: Reference ('N', 'S', 'E', or 'W')
 
     Returns:
         Decimal degrees or None
@@ -178,15 +336,15 @@ def _convert_gps_to_degrees(
 
     try:
         # Extract degrees, minutes, seconds
-        degrees = gps_coord[0][0] / gps_coord[0][1]
-        minutes = gps_coord[1][0] / gps_coord[1][1]
-        seconds = gps_coord[2][0] / gps_coord[2][1]
+        degrees = gps_coord[0].numerator / gps_coord[0].denominator
+        minutes = gps_coord[1].numerator / gps_coord[1].denominator
+        seconds = gps_coord[2].numerator / gps_coord[2].denominator
 
         # Convert to decimal degrees
         decimal = degrees + (minutes / 60.0) + (seconds / 3600.0)
 
         # Apply direction (S and W are negative)
-        if gps_ref in [b'S', b'W']:
+        if _ref_byte(gps_ref) in (b'S', b'W'):
             decimal = -decimal
 
         return decimal
@@ -195,38 +353,111 @@ def _convert_gps_to_degrees(
         return None
 
 
-def _extract_camera_info(exif_dict: Dict) -> Tuple[Optional[str], Optional[str]]:
+def _format_location(lat: float, lon: float) -> str:
+    """Format decimal degrees as e.g. "40.7128N, 74.0060W"."""
+    lat_dir = "N" if lat >= 0 else "S"
+    lon_dir = "E" if lon >= 0 else "W"
+    return f"{abs(lat):.4f}{lat_dir}, {abs(lon):.4f}{lon_dir}"
+
+
+def _extract_gps_rationals(tags: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    Pull the raw GPS rationals out of the EXIF tags.
+
+    Args:
+        tags: EXIF tags by name from _collect_tags()
+
+    Returns:
+        Record matching GPS_DTYPE, or None if GPS data is missing or malformed
+    """
+    lat = tags.get('GPSLatitude')
+    lat_ref = tags.get('GPSLatitudeRef')
+    lon = tags.get('GPSLongitude')
+    lon_ref = tags.get('GPSLongitudeRef')
+    if not (lat and lat_ref and lon and lon_ref):
+        return None
+
+    try:
+        return (
+            [int(v.numerator) for v in lat[:3]], [int(v.denominator) for v in lat[:3]],
+            [int(v.numerator) for v in lon[:3]], [int(v.denominator) for v in lon[:3]],
+            _ref_byte(lat_ref), _ref_byte(lon_ref),
+        )
+    except (AttributeError, TypeError, ValueError, IndexError):
+        return None
+
+
+def _ref_byte(ref: Any) -> bytes:
+    """Normalize a GPS reference ('N' or b'N') to a single byte."""
+    if isinstance(ref, str):
+        ref = ref.encode('ascii', 'ignore')
+    return bytes(ref[:1]).upper()
+
+
+def _rationals_to_degrees(
+    num: np.ndarray,
+    den: np.ndarray,
+    ref: np.ndarray,
+    negative_ref: bytes
+) -> np.ndarray:
+    """
+    Convert (N, 3) degree/minute/second rationals to decimal degrees.
+
+    One vectorized NumPy expression over all rows.
+
+    Args:
+        num: Numerators of degrees, minutes, seconds
+        den: Denominators of degrees, minutes, seconds
+        ref: Hemisphere reference per row
+        negative_ref: Reference that makes the coordinate negative (b'S' or b'W')
+
+    Returns:
+        Decimal degrees; rows with a zero denominator are non-finite
+    """
+    negative = ref == negative_ref
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deg = (
+            num[:, 0] / den[:, 0]
+            + num[:, 1] / (den[:, 1] * 60.0)
+            + num[:, 2] / (den[:, 2] * 3600.0)
+        )
+    return np.where(negative, -deg, deg)
+
+
+@lru_cache(maxsize=1)
+def _register_heif_opener() -> bool:
+    """Let Image.open() read HEIC/HEIF headers if pillow-heif is installed."""
+    try:
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+        return True
+    except ImportError:
+        return False
+
+
+def _extract_camera_info(tags: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract camera make and model from EXIF.
 
     Args:
-        exif_dict: EXIF dictionary from piexif
+        tags: EXIF tags by name from _collect_tags()
 
     Returns:
         Tuple of (camera_make, camera_model) or (None, None)
     """
-    camera_make = None
-    camera_model = None
+    return _tag_text(tags.get('Make')), _tag_text(tags.get('Model'))
 
-    try:
-        if "0th" in exif_dict:
-            # Get camera make
-            make_bytes = exif_dict["0th"].get(piexif.ImageIFD.Make)
-            if make_bytes:
-                if isinstance(make_bytes, bytes):
-                    camera_make = make_bytes.decode('utf-8').strip('\x00')
-                else:
-                    camera_make = str(make_bytes)
-
-            # Get camera model
-            model_bytes = exif_dict["0th"].get(piexif.ImageIFD.Model)
-            if model_bytes:
-                if isinstance(model_bytes, bytes):
-                    camera_model = model_bytes.decode('utf-8').strip('\x00')
-                else:
-                    camera_model = str(model_bytes)
 
-    except Exception:
-        pass
+def _tag_text(value: Any) -> Optional[str]:
+    """Decode an ASCII EXIF tag value, dropping NUL padding."""
+    if not value:
+        return None
 
-    return camera_make, camera_model
+    try:
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        text = str(value).strip('\x00')
+        return text or None
+    except Exception:
+        return None
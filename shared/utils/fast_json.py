@@ -0,0 +1,59 @@
+"""
+Fast JSON
+JSON decoding and encoding that uses orjson when it is installed.
+
+orjson parses API responses several times faster than the standard
+library and accepts the raw response bytes directly. Without it, the
+stdlib json module is used with the same interface.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    # Optional: fall back to the standard library
+    orjson = None
+
+
+# Both orjson.JSONDecodeError and json.JSONDecodeError subclass ValueError
+JSONDecodeError = ValueError
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text as bytes or str
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize an object to JSON text.
+
+    Args:
+        obj: JSON-serializable object
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON text
+
+    Raises:
+        TypeError: If obj is not JSON-serializable
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None)
@@ -0,0 +1,183 @@
+"""
+Feature Cache
+On-disk cache of per-file EXIF results keyed by (path, mtime, size).
+
+Re-running the organizer on the same directory would otherwise re-open
+and re-parse every image. Results are kept in a Parquet file (requires
+the optional pyarrow package) that is loaded into a dict on first use and
+rewritten when new entries were added. Without pyarrow the cache still
+works, but only for the lifetime of the process.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".ai_os" / "feature_cache.parquet"
+
+# EXIF fields stored as ISO strings in the JSON column
+_DATETIME_FIELDS = ('date_taken',)
+
+
+class FeatureCache:
+    """
+    Cache of per-file extraction results.
+
+    An entry is only returned while the file's mtime and size still match
+    the values it was stored with.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_path: Parquet file the cache is persisted to
+                (default: ~/.ai_os/feature_cache.parquet)
+        """
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size, exif_json)
+        self._entries: Optional[Dict[str, Tuple[int, int, str]]] = None
+        self._dirty = False
+
+    def get_exif(self, path: str, stat: os.stat_result) -> Optional[Dict]:
+        """
+        Look up cached EXIF data for a file.
+
+        Args:
+            path: File path
+            stat: Current os.stat() of the file
+
+        Returns:
+            EXIF dictionary as returned by extract_exif_data(), or None on a miss
+        """
+        with self._lock:
+            entry = self._load().get(path)
+
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            return None
+
+        try:
+            return _exif_from_json(entry[2])
+        except (ValueError, TypeError):
+            return None
+
+    def put_exif(self, path: str, stat: os.stat_result, exif: Dict):
+        """
+        Store EXIF data for a file.
+
+        Args:
+            path: File path
+            stat: os.stat() of the file the data was extracted from
+            exif: EXIF dictionary from extract_exif_data()
+        """
+        exif_json = _exif_to_json(exif)
+        with self._lock:
+            self._load()[path] = (stat.st_mtime_ns, stat.st_size, exif_json)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to cache_path if entries were added since loading."""
+        pa, pq = _import_pyarrow()
+        if pa is None:
+            return
+
+        with self._lock:
+            if not self._entries or not self._dirty:
+                return
+
+            paths = list(self._entries)
+            mtimes, sizes, exif_json = zip(*self._entries.values())
+            table = pa.table({
+                'path': pa.array(paths, pa.string()),
+                'mtime_ns': pa.array(mtimes, pa.int64()),
+                'size': pa.array(sizes, pa.int64()),
+                'exif_json': pa.array(exif_json, pa.string()),
+            })
+
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, self.cache_path)
+                self._dirty = False
+            except OSError:
+                # The cache is an optimization only
+                pass
+
+    def _load(self) -> Dict[str, Tuple[int, int, str]]:
+        """Get the entry index, reading the Parquet file on first use. Caller holds _lock."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        pa, pq = _import_pyarrow()
+        if pa is None:
+            return self._entries
+
+        try:
+            table = pq.read_table(self.cache_path)
+            self._entries = dict(zip(
+                table.column('path').to_pylist(),
+                zip(
+                    table.column('mtime_ns').to_pylist(),
+                    table.column('size').to_pylist(),
+                    table.column('exif_json').to_pylist(),
+                ),
+            ))
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            # Missing or unreadable cache file; start cold
+            pass
+        return self._entries
+
+
+# ===== Module-level cache =====
+
+_cache: Optional[FeatureCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_feature_cache() -> FeatureCache:
+    """Get the process-wide feature cache instance."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FeatureCache()
+        return _cache
+
+
+# ===== Helper Functions =====
+
+def _exif_to_json(exif: Dict) -> str:
+    """Serialize an EXIF dictionary, writing datetimes as ISO strings."""
+    data = dict(exif)
+    for field in _DATETIME_FIELDS:
+        if isinstance(data.get(field), datetime):
+            data[field] = data[field].isoformat()
+    return json.dumps(data)
+
+
+def _exif_from_json(text: str) -> Dict:
+    """Inverse of _exif_to_json()."""
+    data = json.loads(text)
+    for field in _DATETIME_FIELDS:
+        if data.get(field):
+            data[field] = datetime.fromisoformat(data[field])
+    return data
+
+
+@lru_cache(maxsize=1)
+def _import_pyarrow():
+    """Import the optional pyarrow package, or (None, None) when unavailable."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow, pyarrow.parquet
+    except ImportError:
+        return None, None
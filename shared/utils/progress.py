@@ -4,10 +4,15 @@ Shows execution progress as nodes complete in the graph.
 """
 
 import sys
+import time
 from datetime import datetime
 from typing import Optional
 
 
+# Minimum seconds between stdout flushes
+FLUSH_INTERVAL = 0.1
+
+
 class ProgressTracker:
     """
     Tracks and displays progress through the file organization pipeline.
@@ -28,6 +33,11 @@ class ProgressTracker:
         ("analyze_with_llm", "Generating suggestions"),
     ]
 
+    # Node name -> (1-based step number, label)
+    _NAME_TO_INDEX = {
+        name: (i + 1, label) for i, (name, label) in enumerate(NODES)
+    }
+
     def __init__(self, enabled: bool = True):
         """
         Initialize progress tracker.
@@ -40,6 +50,26 @@ class ProgressTracker:
         self.total_steps = len(self.NODES)
         self.start_time = None
         self.step_times = {}
+        self._last_flush = 0.0
+
+        if not enabled:
+            # Quiet mode: per-node callbacks become no-ops
+            self.update = _noop
+            self.show_step_summary = _noop
+
+    def _write(self, text: str, force: bool = False):
+        """
+        Write to stdout, flushing at most every FLUSH_INTERVAL seconds.
+
+        Args:
+            text: Text to write
+            force: Flush now regardless of the interval
+        """
+        sys.stdout.write(text)
+        now = time.monotonic()
+        if force or now - self._last_flush >= FLUSH_INTERVAL:
+            sys.stdout.flush()
+            self._last_flush = now
 
     def start(self):
         """Start tracking progress."""
@@ -47,7 +77,7 @@ class ProgressTracker:
             return
 
         self.start_time = datetime.now()
-        print("Analyzing files...\n")
+        self._write("Analyzing files...\n\n")
 
     def update(self, node_name: str, status: str = "running"):
         """
@@ -61,21 +91,14 @@ class ProgressTracker:
             return
 
         # Find node index
-        node_index = None
-        label = node_name
-
-        for i, (name, node_label) in enumerate(self.NODES):
-            if name == node_name:
-                node_index = i + 1
-                label = node_label
-                break
-
-        if node_index is None:
+        hit = self._NAME_TO_INDEX.get(node_name)
+        if hit is None:
             return
+        node_index, label = hit
 
         if status == "running":
-            # Show node starting
-            print(f"  [{node_index}/{self.total_steps}] {label}...", end="", flush=True)
+            # Show node starting; flushed now since the node may run a while
+            self._write(f"  [{node_index}/{self.total_steps}] {label}...", force=True)
             self.step_times[node_name] = datetime.now()
 
         elif status == "complete":
@@ -86,10 +109,10 @@ class ProgressTracker:
                 if duration > 0.1:
                     elapsed = f" ({duration:.1f}s)"
 
-            print(f" done{elapsed}")
+            self._write(f" done{elapsed}\n")
 
         elif status == "error":
-            print(f" FAILED")
+            self._write(" FAILED\n", force=True)
 
     def finish(self):
         """Show completion message."""
@@ -97,7 +120,7 @@ class ProgressTracker:
             return
 
         total_time = (datetime.now() - self.start_time).total_seconds()
-        print(f"\nTotal time: {total_time:.1f}s\n")
+        self._write(f"\nTotal time: {total_time:.1f}s\n\n", force=True)
 
     def show_step_summary(self, state: dict):
         """
@@ -114,7 +137,7 @@ class ProgressTracker:
             count = state["total_files_scanned"]
             size = state.get("total_size_bytes", 0)
             size_mb = size / (1024 * 1024)
-            print(f"     -> Found {count} files ({size_mb:.1f} MB)")
+            self._write(f"     -> Found {count} files ({size_mb:.1f} MB)\n")
 
         # Show classification after classify
         if "image_files" in state and state["image_files"] is not None:
@@ -124,14 +147,19 @@ class ProgressTracker:
             other_count = len(state.get("other_files", []))
 
             if img_count + txt_count + doc_count + other_count > 0:
-                print(f"     -> {img_count} images, {txt_count} text, {doc_count} docs, {other_count} other")
+                self._write(f"     -> {img_count} images, {txt_count} text, {doc_count} docs, {other_count} other\n")
 
         # Show image analysis count
         if "image_analysis" in state and state["image_analysis"]:
             analyzed = len(state["image_analysis"])
             total = len(state.get("image_files", []))
             if total > 0:
-                print(f"     -> Analyzed {analyzed}/{total} images")
+                self._write(f"     -> Analyzed {analyzed}/{total} images\n")
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for tracker callbacks in quiet mode."""
+    return None
 
 
 # Global progress tracker instance
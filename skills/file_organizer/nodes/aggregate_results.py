@@ -25,7 +25,7 @@ def aggregate_results(state: OrganizerState) -> OrganizerState:
     Returns:
         Updated state with aggregated_analysis dictionary
     """
-    warnings = state.get("warnings", []).copy()
+    warnings = state.setdefault("warnings", [])
 
     # Gather all analysis results
     image_analysis = state.get("image_analysis") or []
@@ -76,7 +76,6 @@ def aggregate_results(state: OrganizerState) -> OrganizerState:
         f"dominant type: {aggregated['dominant_type']}"
     )
     warnings.append(summary)
-    state["warnings"] = warnings
 
     return state
 
@@ -3,14 +3,27 @@ Analyze Image Node
 Analyzes images using vision LLM and EXIF metadata extraction.
 """
 
+import hashlib
+from collections import defaultdict
+
 from shared.models.state import OrganizerState
 from shared.models.analysis import ImageAnalysis
 from shared.providers.vision import OllamaVisionProvider
-from shared.utils.exif_extractor import extract_exif_data
+from shared.utils.exif_extractor import extract_exif_batch
+from shared.utils.analysis_cache import AnalysisCache, file_cache_key
+from shared.utils.fast_io import open_noatime
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 
 
+# Images in flight through the vision pipeline when the state doesn't say
+DEFAULT_VISION_BATCH_SIZE = 8
+
+# Read size when hashing same-size images to find duplicates
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
 def analyze_images(state: OrganizerState) -> OrganizerState:
     """
     Analyze all image files using vision LLM and EXIF extraction.
@@ -20,6 +33,10 @@ def analyze_images(state: OrganizerState) -> OrganizerState:
     2. Analyze visual content with vision LLM
     3. Combine into ImageAnalysis object
 
+    Vision results are cached per (path, size, mtime, model); images
+    whose result is cached skip the vision model entirely. Byte-identical
+    copies of an image are sent to the model once and share its result.
+
     Args:
         state: Current graph state with image_files
 
@@ -27,44 +44,86 @@ def analyze_images(state: OrganizerState) -> OrganizerState:
         Updated state with image_analysis results
     """
     image_files = state.get("image_files", [])
-    warnings = state.get("warnings", []).copy()
-    errors = state.get("errors", []).copy()
+    warnings = state.setdefault("warnings", [])
+    errors = state.setdefault("errors", [])
 
     # If no images, skip
     if not image_files:
         state["image_analysis"] = []
         return state
 
-    # Create vision provider
+    image_paths = [image_file.path for image_file in image_files]
+
+    # Reuse vision results from earlier runs for unchanged images
+    vision_provider = None
     try:
         vision_provider = OllamaVisionProvider()
-
-        # Check if vision model is available
-        if not vision_provider.is_available():
-            warnings.append(
-                "Vision model not available. Install with: ollama pull llava:7b\n"
-                "Skipping image analysis."
-            )
+        cache = AnalysisCache()
+        cache_keys = [file_cache_key(path, vision_provider.model) for path in image_paths]
+        cached = cache.get_many(cache_keys)
+    except Exception as e:
+        if vision_provider is None:
+            warnings.append(f"Could not initialize vision provider: {e}")
             state["image_analysis"] = []
-            state["warnings"] = warnings
             return state
-    except Exception as e:
-        warnings.append(f"Could not initialize vision provider: {e}")
+        cache = None
+        cache_keys = [None] * len(image_paths)
+        cached = {}
+
+    miss_indices = [i for i, key in enumerate(cache_keys) if key not in cached]
+
+    # Check if vision model is available (only needed for uncached images)
+    if miss_indices and not vision_provider.is_available():
+        warnings.append(
+            "Vision model not available. Install with: ollama pull llava:7b\n"
+            "Skipping image analysis."
+        )
         state["image_analysis"] = []
-        state["warnings"] = warnings
         return state
 
-    # Analyze each image
-    image_analysis_results = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Extract EXIF metadata for all images in the background while
+        # the vision model works
+        exif_future = executor.submit(extract_exif_batch, image_paths, fast=True)
 
-    for image_file in image_files:
-        try:
-            # Extract EXIF metadata
-            exif_data = extract_exif_data(image_file.path)
+        # Analyze visual content with vision LLM; images are loaded, sent, and
+        # parsed in an overlapping pipeline, vision_batch_size at a time
+        vision_results = [cached.get(key) for key in cache_keys]
+        if miss_indices:
+            # Only one copy of each duplicate group goes to the model
+            representatives = _find_duplicates(
+                [image_paths[i] for i in miss_indices],
+                [image_files[i].size for i in miss_indices]
+            )
+            unique = sorted(set(representatives))
+
+            vision_batch_size = state.get("vision_batch_size") or DEFAULT_VISION_BATCH_SIZE
+            unique_results = vision_provider.analyze_images(
+                [image_paths[miss_indices[j]] for j in unique],
+                concurrency=vision_batch_size
+            )
+            by_representative = dict(zip(unique, unique_results))
+            fresh_results = [by_representative[j] for j in representatives]
+            for i, result in zip(miss_indices, fresh_results):
+                vision_results[i] = result
+
+            if cache is not None:
+                # Failed analyses carry no scene or objects; retry them next run
+                cache.put_many({
+                    cache_keys[i]: result
+                    for i, result in zip(miss_indices, fresh_results)
+                    if result.get('scene') or result.get('objects')
+                })
 
-            # Analyze visual content with vision LLM
-            vision_result = vision_provider.analyze_image(image_file.path)
+        exif_results = exif_future.result()
 
+    # Combine with EXIF for each image
+    image_analysis_results = []
+
+    for image_file, vision_result, exif_data in zip(
+        image_files, vision_results, exif_results
+    ):
+        try:
             # Combine into ImageAnalysis
             image_analysis = _create_image_analysis(
                 image_file=image_file,
@@ -79,8 +138,6 @@ def analyze_images(state: OrganizerState) -> OrganizerState:
 
     # Store results
     state["image_analysis"] = image_analysis_results
-    state["warnings"] = warnings
-    state["errors"] = errors
 
     # Add summary
     if image_analysis_results:
@@ -89,6 +146,52 @@ def analyze_images(state: OrganizerState) -> OrganizerState:
     return state
 
 
+def _find_duplicates(paths: List[str], sizes: List[int]) -> List[int]:
+    """
+    Find byte-identical files.
+
+    Files are grouped by size first, so only files that share a size with
+    another one are hashed.
+
+    Args:
+        paths: File paths
+        sizes: File sizes in bytes, parallel to paths
+
+    Returns:
+        For each path, the index of the first path with identical content
+        (its own index if it has no earlier duplicate)
+    """
+    representatives = list(range(len(paths)))
+
+    by_size = defaultdict(list)
+    for i, size in enumerate(sizes):
+        by_size[size].append(i)
+
+    for group in by_size.values():
+        if len(group) < 2:
+            continue
+        first_by_digest = {}
+        for i in group:
+            digest = _content_digest(paths[i])
+            if digest is None:
+                continue
+            representatives[i] = first_by_digest.setdefault(digest, i)
+
+    return representatives
+
+
+def _content_digest(path: str) -> Optional[bytes]:
+    """Hash a file's full contents, or None if it cannot be read."""
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        with open_noatime(path) as f:
+            while chunk := f.read(HASH_CHUNK_BYTES):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.digest()
+
+
 def _create_image_analysis(
     image_file,
     exif_data: dict,
@@ -99,18 +202,18 @@ def _create_image_analysis(
 
     Args:
         image_file: FileMetadata object
-        exif_data: Dictionary from extract_exif_data()
+        exif_data: Dictionary from extract_exif_batch()
         vision_result: Dictionary from vision provider
 
     Returns:
         ImageAnalysis object
     """
     # Extract EXIF fields
-    date_taken = exif_data.get("datetime")
-    location = exif_data.get("gps_location")
-    camera_make = exif_data.get("make")
-    camera_model = exif_data.get("model")
-    dimensions = exif_data.get("dimensions")
+    date_taken = exif_data.get("date_taken")
+    location = exif_data.get("location")
+    camera_make = exif_data.get("camera_make")
+    camera_model = exif_data.get("camera_model")
+    dimensions = exif_data.get("image_dimensions")
 
     # Extract vision analysis fields
     description = vision_result.get("description", "")
@@ -65,7 +65,7 @@ def analyze_other(state: OrganizerState) -> OrganizerState:
 
     document_files = state.get("document_files", [])
     other_files = state.get("other_files", [])
-    warnings = state.get("warnings", []).copy()
+    warnings = state.setdefault("warnings", [])
 
     all_other = document_files + other_files
 
@@ -100,7 +100,6 @@ def analyze_other(state: OrganizerState) -> OrganizerState:
             f"and {len(other_files)} other files"
         )
 
-    state["warnings"] = warnings
     update_progress("analyze_other", "complete")
     return state
 
@@ -4,11 +4,18 @@ Extracts content and metadata from text files using LLM analysis
 with extension-based heuristic fallback.
 """
 
-import json
-import requests
+import asyncio
+import hashlib
 from shared.models.state import OrganizerState
 from typing import Dict, List, Optional
+from shared.providers.async_ollama import generate_many
+from shared.providers.http import create_session, list_installed_models
+from shared.utils import fast_json
 from shared.utils.progress import update_progress
+from shared.utils.analysis_cache import AnalysisCache, file_cache_key
+
+
+OLLAMA_BASE_URL = "http://localhost:11434"
 
 
 # Extension -> language mapping for code files
@@ -18,7 +25,7 @@ EXTENSION_LANGUAGE_MAP = {
     ".java": "java", ".cpp": "c++", ".c": "c", ".h": "c",
     ".cs": "c#", ".go": "go", ".rs": "rust", ".rb": "ruby",
     ".php": "php", ".swift": "swift", ".kt": "kotlin",
-    ".scala": "scala", ".r": "r", ".R": "r",
+    ".scala": "scala", ".r": "r",
     ".sh": "shell", ".bash": "shell", ".zsh": "shell",
     ".ps1": "powershell", ".bat": "batch",
     ".html": "html", ".css": "css", ".scss": "scss",
@@ -28,6 +35,36 @@ EXTENSION_LANGUAGE_MAP = {
     ".vue": "vue", ".svelte": "svelte",
 }
 
+# Concurrent LLM requests when the state doesn't say; the Ollama server
+# only overlaps them up to its own OLLAMA_NUM_PARALLEL
+DEFAULT_LLM_PARALLEL = 4
+
+DEFAULT_TEXT_MODEL = "llama3.2:3b"
+
+# Heuristic document types still worth an LLM call; anything else
+# (code, config, data, ...) is already determined by the extension
+LLM_DOCUMENT_TYPES = frozenset({"other", "notes"})
+
+# Prompt for _build_prompt(); filled per file with str.format
+PROMPT_TEMPLATE = (
+    "Analyze this file and respond with ONLY a JSON object.\n\n"
+    "File: {name} ({extension})\n"
+    "Content preview:\n```\n{preview}\n```\n\n"
+    "Respond with this exact JSON structure:\n"
+    '{{"topics": ["topic1", "topic2"], '
+    '"document_type": "code|notes|config|data|readme|log|other", '
+    '"summary": "one sentence description"}}'
+)
+
+# Generation options shared by every text-analysis request
+GENERATE_OPTIONS = {
+    "temperature": 0.1,
+    "num_predict": 80,
+}
+
+# Characters of content preview included in the prompt
+PREVIEW_CHARS = 250
+
 # Extension -> document type mapping
 EXTENSION_DOCTYPE_MAP = {
     # Code
@@ -56,7 +93,8 @@ def analyze_text(state: OrganizerState) -> OrganizerState:
     """
     Analyze text files using LLM with heuristic fallback.
 
-    Attempts LLM-based analysis for richer metadata (topics, summary).
+    Attempts LLM-based analysis for richer metadata (topics, summary) on
+    files whose extension leaves the document type open (notes, other).
     Falls back to extension-based heuristics if LLM is unavailable.
 
     Args:
@@ -68,27 +106,45 @@ def analyze_text(state: OrganizerState) -> OrganizerState:
     update_progress("analyze_text", "running")
 
     text_files = state.get("text_files", [])
-    warnings = state.get("warnings", []).copy()
+    warnings = state.setdefault("warnings", [])
 
     if not text_files:
         state["text_analysis"] = []
-        state["warnings"] = warnings
         update_progress("analyze_text", "complete")
         return state
 
-    # Try LLM-based analysis, fall back to heuristics
-    llm_available = _check_llm_available(state)
-
     text_analysis = []
+    llm_jobs = []
+    # Heuristics depend only on extension and content type; classify each
+    # distinct pair once
+    heuristics: Dict[tuple, Dict] = {}
     for file in text_files:
         analysis = _build_base_analysis(file)
 
         # Apply heuristic classification (always runs)
-        analysis.update(_heuristic_classify(file))
+        key = (file.extension, file.content_type)
+        heuristic = heuristics.get(key)
+        if heuristic is None:
+            heuristic = heuristics[key] = _heuristic_classify(*key)
+        analysis.update(heuristic)
+        text_analysis.append(analysis)
 
-        # Enrich with LLM if available and file has content
-        if llm_available and file.content_preview:
-            llm_result = _llm_analyze(file, state)
+        # Only ask the LLM about files the extension doesn't settle
+        if analysis["document_type"] in LLM_DOCUMENT_TYPES and file.content_preview:
+            llm_jobs.append((analysis, file))
+
+    # Try LLM-based analysis, fall back to heuristics
+    llm_available = bool(llm_jobs) and _check_llm_available(state)
+    cache = _open_cache() if llm_available else None
+
+    # LLM requests are independent; keep several in flight at once
+    if llm_available:
+        model = _resolve_text_model(state)
+        llm_parallel = state.get("llm_parallel") or DEFAULT_LLM_PARALLEL
+        llm_results = _llm_analyze_many(
+            [file for _, file in llm_jobs], model, cache, llm_parallel
+        )
+        for (analysis, _), llm_result in zip(llm_jobs, llm_results):
             if llm_result:
                 if llm_result.get("topics"):
                     analysis["topics"] = llm_result["topics"]
@@ -97,15 +153,12 @@ def analyze_text(state: OrganizerState) -> OrganizerState:
                 if llm_result.get("document_type"):
                     analysis["document_type"] = llm_result["document_type"]
 
-        text_analysis.append(analysis)
-
     state["text_analysis"] = text_analysis
 
     if text_files:
         llm_note = " (LLM-enriched)" if llm_available else " (heuristic)"
         warnings.append(f"Analyzed {len(text_files)} text files{llm_note}")
 
-    state["warnings"] = warnings
     update_progress("analyze_text", "complete")
     return state
 
@@ -127,10 +180,10 @@ def _build_base_analysis(file) -> Dict:
     }
 
 
-def _heuristic_classify(file) -> Dict:
-    """Classify text file using extension-based heuristics."""
+def _heuristic_classify(extension: Optional[str], content_type: Optional[str]) -> Dict:
+    """Classify a text file from its extension and content type."""
     result = {}
-    ext = file.extension.lower() if file.extension else ""
+    ext = extension.lower() if extension else ""
 
     # Detect language
     if ext in EXTENSION_LANGUAGE_MAP:
@@ -139,7 +192,7 @@ def _heuristic_classify(file) -> Dict:
     # Detect document type
     if ext in EXTENSION_DOCTYPE_MAP:
         result["document_type"] = EXTENSION_DOCTYPE_MAP[ext]
-    elif file.content_type == "code":
+    elif content_type == "code":
         result["document_type"] = "code"
 
     return result
@@ -148,79 +201,112 @@ def _heuristic_classify(file) -> Dict:
 def _check_llm_available(state: OrganizerState) -> bool:
     """Check if Ollama LLM is available for text analysis."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=3)
-        return response.status_code == 200
+        # The model listing is cached for a short TTL across providers, so
+        # this session only makes a request when that cache is cold;
+        # generation requests go through generate_many()'s own client
+        with create_session(pool_connections=1, pool_maxsize=1) as session:
+            list_installed_models(session, OLLAMA_BASE_URL)
+        return True
     except Exception:
         return False
 
 
-def _llm_analyze(file, state: OrganizerState) -> Optional[Dict]:
-    """
-    Analyze a single text file using the LLM.
+def _open_cache() -> Optional[AnalysisCache]:
+    """Open the analysis cache, or None if it cannot be opened."""
+    try:
+        return AnalysisCache()
+    except Exception:
+        return None
 
-    Uses a lightweight prompt to extract topics, document type, and summary
-    from the content preview.
-    """
-    model = state.get("llm_model", "llama3.2:3b")
+
+def _resolve_text_model(state: OrganizerState) -> str:
+    """Model used for text analysis."""
+    model = state.get("llm_model") or DEFAULT_TEXT_MODEL
     # Use the text model, not the vision model
     if "llava" in model:
-        model = "llama3.2:3b"
+        model = DEFAULT_TEXT_MODEL
+    return model
 
-    preview = (file.content_preview or "")[:500]
-    if not preview.strip():
-        return None
-
-    prompt = (
-        f"Analyze this file and respond with ONLY a JSON object.\n\n"
-        f"File: {file.name} ({file.extension})\n"
-        f"Content preview:\n```\n{preview}\n```\n\n"
-        f"Respond with this exact JSON structure:\n"
-        f'{{"topics": ["topic1", "topic2"], '
-        f'"document_type": "code|notes|config|data|readme|log|other", '
-        f'"summary": "one sentence description"}}'
-    )
 
-    try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.2,
-                    "num_predict": 200,
-                },
-            },
-            timeout=30,
-        )
+def _llm_analyze_many(
+    files: List,
+    model: str,
+    cache: Optional[AnalysisCache],
+    concurrency: int
+) -> List[Optional[Dict]]:
+    """
+    Analyze text files with the LLM, reusing cached results when possible.
 
-        if response.status_code != 200:
-            return None
+    Uncached files are sent in one batch of concurrent requests. Results
+    are keyed by the file's path, size and mtime, the model, and a hash of
+    the preview the prompt is built from.
 
-        raw = response.json().get("response", "")
+    Returns:
+        LLM result per file, in order; None where analysis failed
+    """
+    keys = [None] * len(files)
+    cached = {}
+    if cache is not None:
+        keys = [_llm_cache_key(file, model) for file in files]
+        cached = cache.get_many(keys)
+    results = [cached.get(key) if key else None for key in keys]
+
+    prompts = {
+        i: _build_prompt(file)
+        for i, file in enumerate(files)
+        if results[i] is None
+    }
+    misses = [i for i, prompt in prompts.items() if prompt is not None]
+    if not misses:
+        return results
+
+    responses = asyncio.run(generate_many(
+        [prompts[i] for i in misses],
+        model,
+        concurrency=concurrency,
+        base_url=OLLAMA_BASE_URL,
+        options=GENERATE_OPTIONS,
+        # Constrain the output to valid JSON
+        format="json",
+    ))
+    for i, raw in zip(misses, responses):
+        results[i] = _parse_llm_json(raw) if raw else None
+
+    if cache is not None:
+        cache.put_many({keys[i]: results[i] for i in misses if results[i] and keys[i]})
+    return results
+
+
+def _llm_cache_key(file, model: str) -> Optional[str]:
+    """Cache key for a file's LLM result, or None if it cannot be stat'ed."""
+    preview_hash = hashlib.blake2b(
+        (file.content_preview or "")[:PREVIEW_CHARS].encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return file_cache_key(file.path, model, preview_hash)
+
+
+def _build_prompt(file) -> Optional[str]:
+    """
+    Build the analysis prompt for a text file.
 
-        # Extract JSON from response
-        return _parse_llm_json(raw)
-    except Exception:
+    Uses a lightweight prompt to extract topics, document type, and summary
+    from the content preview; None when there is no preview to analyze.
+    """
+    preview = (file.content_preview or "")[:PREVIEW_CHARS]
+    if not preview.strip():
         return None
 
+    return PROMPT_TEMPLATE.format(
+        name=file.name,
+        extension=file.extension,
+        preview=preview
+    )
+
 
 def _parse_llm_json(raw: str) -> Optional[Dict]:
-    """Extract and parse JSON from LLM response."""
-    # Try direct parse
+    """Parse the LLM response, which JSON mode guarantees is a JSON document."""
     try:
-        return json.loads(raw.strip())
-    except json.JSONDecodeError:
-        pass
-
-    # Try to find JSON object in response
-    start = raw.find("{")
-    end = raw.rfind("}") + 1
-    if start >= 0 and end > start:
-        try:
-            return json.loads(raw[start:end])
-        except json.JSONDecodeError:
-            pass
-
-    return None
+        result = fast_json.loads(raw)
+    except fast_json.JSONDecodeError:
+        return None
+    return result if isinstance(result, dict) else None
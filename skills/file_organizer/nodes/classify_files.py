@@ -8,23 +8,31 @@ from shared.models.file_metadata import FileMetadata
 
 
 # File type classifications
-IMAGE_EXTENSIONS = {
+IMAGE_EXTENSIONS = frozenset({
     '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.svg',
     '.tiff', '.tif', '.ico', '.heic', '.heif', '.raw', '.cr2', '.nef'
-}
+})
 
-TEXT_EXTENSIONS = {
+TEXT_EXTENSIONS = frozenset({
     '.txt', '.md', '.markdown', '.rst', '.log',
     '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.h',
     '.cs', '.go', '.rs', '.rb', '.php', '.swift', '.kt', '.scala',
     '.html', '.css', '.scss', '.sass', '.xml', '.json', '.yaml', '.yml',
     '.sh', '.bash', '.sql', '.r', '.m',
-}
+})
 
-DOCUMENT_EXTENSIONS = {
+DOCUMENT_EXTENSIONS = frozenset({
     '.pdf', '.doc', '.docx', '.odt', '.rtf',
     '.xls', '.xlsx', '.ods', '.csv',
     '.ppt', '.pptx', '.odp',
+})
+
+# Extension -> category in one table; later entries win, so image beats
+# text beats document if a set ever overlaps
+_EXT_TO_CATEGORY = {
+    **{ext: "document" for ext in DOCUMENT_EXTENSIONS},
+    **{ext: "text" for ext in TEXT_EXTENSIONS},
+    **{ext: "image" for ext in IMAGE_EXTENSIONS},
 }
 
 
@@ -42,26 +50,19 @@ def classify_files(state: OrganizerState) -> OrganizerState:
         Updated state with classified file lists
     """
     files = state.get("files", [])
-    warnings = state.get("warnings", []).copy()
+    warnings = state.setdefault("warnings", [])
 
     # Initialize categorized lists
-    image_files = []
-    text_files = []
-    document_files = []
-    other_files = []
+    buckets = {"image": [], "text": [], "document": [], "other": []}
 
-    # Classify each file
+    # The scan already stored each file's category
     for file in files:
-        extension = file.extension.lower()
+        buckets[file.category or get_file_category(file)].append(file)
 
-        if extension in IMAGE_EXTENSIONS:
-            image_files.append(file)
-        elif extension in TEXT_EXTENSIONS:
-            text_files.append(file)
-        elif extension in DOCUMENT_EXTENSIONS:
-            document_files.append(file)
-        else:
-            other_files.append(file)
+    image_files = buckets["image"]
+    text_files = buckets["text"]
+    document_files = buckets["document"]
+    other_files = buckets["other"]
 
     # Update state with classified files
     state["image_files"] = image_files
@@ -81,8 +82,6 @@ def classify_files(state: OrganizerState) -> OrganizerState:
         )
         warnings.append(summary)
 
-    state["warnings"] = warnings
-
     return state
 
 
@@ -96,13 +95,17 @@ def get_file_category(file: FileMetadata) -> str:
     Returns:
         Category string: "image", "text", "document", or "other"
     """
-    extension = file.extension.lower()
-
-    if extension in IMAGE_EXTENSIONS:
-        return "image"
-    elif extension in TEXT_EXTENSIONS:
-        return "text"
-    elif extension in DOCUMENT_EXTENSIONS:
-        return "document"
-    else:
-        return "other"
+    return file.category or get_extension_category(file.extension)
+
+
+def get_extension_category(extension: str) -> str:
+    """
+    Get the category for a file extension.
+
+    Args:
+        extension: File extension including the dot
+
+    Returns:
+        Category string: "image", "text", "document", or "other"
+    """
+    return _EXT_TO_CATEGORY.get(extension.lower(), "other")
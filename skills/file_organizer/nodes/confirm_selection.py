@@ -20,11 +20,10 @@ def confirm_selection(state: OrganizerState) -> OrganizerState:
         Updated state with selected_suggestion
     """
     suggestions_response = state.get("suggestions")
-    errors = state.get("errors", []).copy()
+    errors = state.setdefault("errors", [])
 
     if not suggestions_response or not suggestions_response.suggestions:
         errors.append("No suggestions to confirm")
-        state["errors"] = errors
         state["selected_suggestion"] = None
         return state
 
@@ -3,16 +3,32 @@ File Mover Node
 Executes the selected organization by moving/copying files.
 """
 
+import errno
+import itertools
 import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-from datetime import datetime
 
 from shared.models.state import OrganizerState
 from shared.models.suggestions import Suggestion, FolderStructure
 
 
+# Worker threads for copies and cross-filesystem moves
+DEFAULT_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files at least this large get a sequential-read hint before copying
+LARGE_FILE_BYTES = 64 * 1024 * 1024
+
+# Bytes per os.sendfile() call
+SENDFILE_CHUNK = 8 * 1024 * 1024
+
+# Progress lines buffered between writes to stdout
+OUTPUT_FLUSH_LINES = 256
+
+
 def execute_organization(state: OrganizerState) -> OrganizerState:
     """
     Execute the selected organization suggestion.
@@ -25,7 +41,7 @@ def execute_organization(state: OrganizerState) -> OrganizerState:
     """
     selected = state.get("selected_suggestion")
     files = state.get("files", [])
-    errors = state.get("errors", []).copy()
+    errors = state.setdefault("errors", [])
 
     if state.get("user_cancelled"):
         state["execution_result"] = {"status": "cancelled"}
@@ -33,7 +49,6 @@ def execute_organization(state: OrganizerState) -> OrganizerState:
 
     if not selected:
         errors.append("No suggestion selected for execution")
-        state["errors"] = errors
         state["execution_result"] = {"status": "error", "message": "No suggestion selected"}
         return state
 
@@ -60,7 +75,6 @@ def execute_organization(state: OrganizerState) -> OrganizerState:
 
     if not operations:
         errors.append("No valid file operations to execute")
-        state["errors"] = errors
         state["execution_result"] = {"status": "error", "message": "No valid operations"}
         return state
 
@@ -77,7 +91,6 @@ def execute_organization(state: OrganizerState) -> OrganizerState:
     result = _execute_operations(operations, dry_run, use_copy)
 
     state["execution_result"] = result
-    state["errors"] = errors
 
     return state
 
@@ -170,51 +183,60 @@ def _execute_operations(
             "message": f"Dry run complete. Would process {len(operations)} files."
         }
 
-    success_count = 0
-    error_count = 0
     errors = []
-    created_dirs = set()
 
     action_verb = "Copying" if use_copy else "Moving"
     action_past = "copied" if use_copy else "moved"
 
-    print(f"\n  {action_verb} files...")
-    print("-" * 60)
+    # Group writes by destination directory for locality
+    operations = sorted(operations, key=lambda op: (op[1].parent, op[1].name))
 
-    for source, dest in operations:
+    # Create every destination directory up front, once each
+    created_dirs = set()
+    for dest_dir in {dest.parent for _, dest in operations}:
         try:
-            dest_dir = dest.parent
-            if dest_dir not in created_dirs:
-                dest_dir.mkdir(parents=True, exist_ok=True)
-                created_dirs.add(dest_dir)
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(dest_dir)
+        except OSError as e:
+            errors.append(f"Could not create {dest_dir}: {str(e)}")
 
-            if not os.path.exists(source):
-                errors.append(f"Source not found: {source}")
-                error_count += 1
-                continue
+    operations = _resolve_conflicts(operations, created_dirs)
 
-            if dest.exists():
-                stem = dest.stem
-                suffix = dest.suffix
-                timestamp = datetime.now().strftime("%H%M%S")
-                dest = dest.parent / f"{stem}_{timestamp}{suffix}"
+    print(f"\n  {action_verb} files...")
+    print("-" * 60)
 
-            if use_copy:
-                shutil.copy2(source, dest)
-            else:
-                shutil.move(source, dest)
+    def run(op: Tuple[str, Path]) -> Tuple[Optional[str], Optional[str]]:
+        return _execute_one(op[0], op[1], use_copy)
 
-            success_count += 1
-            print(f"    + {Path(source).name}")
+    executor = None
+    if _needs_parallel_io(operations, created_dirs, use_copy):
+        # Copies (or copy+unlink moves) are I/O bound: overlap them.
+        # map() still yields results in operation order.
+        executor = ThreadPoolExecutor(max_workers=DEFAULT_IO_WORKERS)
+        outcomes = executor.map(run, operations)
+    else:
+        # Same-filesystem moves are a single rename() each
+        outcomes = map(run, operations)
 
-        except PermissionError:
-            errors.append(f"Permission denied: {source}")
-            error_count += 1
-            print(f"    x {Path(source).name} (permission denied)")
-        except Exception as e:
-            errors.append(f"Error with {source}: {str(e)}")
-            error_count += 1
-            print(f"    x {Path(source).name} ({str(e)})")
+    # Progress lines are written in batches rather than one print() per file
+    success_count = 0
+    error_count = 0
+    buffer = []
+    try:
+        for line, error in outcomes:
+            if error:
+                errors.append(error)
+                error_count += 1
+            else:
+                success_count += 1
+            if line:
+                buffer.append(line + "\n")
+            if len(buffer) >= OUTPUT_FLUSH_LINES:
+                _write_lines(buffer)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    _write_lines(buffer)
 
     print("-" * 60)
 
@@ -238,6 +260,161 @@ def _execute_operations(
     return result
 
 
+def _write_lines(buffer: List[str]):
+    """Write buffered progress lines to stdout in one call and clear the buffer."""
+    if buffer:
+        sys.stdout.write("".join(buffer))
+        sys.stdout.flush()
+        buffer.clear()
+
+
+def _execute_one(source: str, dest: Path, use_copy: bool) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Copy or move one file.
+
+    Args:
+        source: Source file path
+        dest: Destination path, already made unique by _resolve_conflicts()
+        use_copy: Copy instead of move
+
+    Returns:
+        Tuple of (progress line or None, error message or None)
+    """
+    try:
+        if not os.path.exists(source):
+            return None, f"Source not found: {source}"
+
+        if use_copy:
+            _copy_file(source, dest)
+        else:
+            _move_file(source, dest)
+
+        return f"    + {Path(source).name}", None
+
+    except PermissionError:
+        return f"    x {Path(source).name} (permission denied)", f"Permission denied: {source}"
+    except Exception as e:
+        return f"    x {Path(source).name} ({str(e)})", f"Error with {source}: {str(e)}"
+
+
+def _resolve_conflicts(
+    operations: List[Tuple[str, Path]],
+    dest_dirs: set
+) -> List[Tuple[str, Path]]:
+    """
+    Rename destinations that would overwrite an existing file.
+
+    Each destination directory is listed once rather than stat'ing every
+    destination, and names assigned here are added to the listing so two
+    operations can never pick the same target. Names are compared
+    casefolded: on case-insensitive filesystems (macOS, Windows) Photo.JPG
+    and photo.jpg are the same file, and rename() would replace it.
+    """
+    dir_contents: Dict[Path, set] = {}
+    for dest_dir in dest_dirs:
+        try:
+            dir_contents[dest_dir] = {name.casefold() for name in os.listdir(dest_dir)}
+        except OSError:
+            dir_contents[dest_dir] = set()
+
+    # One sequence per run; numbers already present are skipped
+    conflict_seq = itertools.count(1)
+    resolved = []
+
+    for source, dest in operations:
+        taken = dir_contents.setdefault(dest.parent, set())
+        name = dest.name
+        if name.casefold() in taken:
+            stem, suffix = dest.stem, dest.suffix
+            while name.casefold() in taken:
+                name = f"{stem}_{next(conflict_seq)}{suffix}"
+            dest = dest.parent / name
+        taken.add(name.casefold())
+        resolved.append((source, dest))
+
+    return resolved
+
+
+def _needs_parallel_io(
+    operations: List[Tuple[str, Path]],
+    dest_dirs: set,
+    use_copy: bool
+) -> bool:
+    """Check whether any operation copies data rather than renaming."""
+    if use_copy:
+        return True
+
+    # One stat per destination directory...
+    dir_devices = {}
+    for dest_dir in dest_dirs:
+        try:
+            dir_devices[dest_dir] = os.stat(dest_dir).st_dev
+        except OSError:
+            continue
+
+    # And one per source directory: files share their directory's device
+    source_devices = {}
+    for source, dest in operations:
+        source_dir = os.path.dirname(source) or '.'
+        if source_dir not in source_devices:
+            try:
+                source_devices[source_dir] = os.stat(source_dir).st_dev
+            except OSError:
+                # Missing sources are reported by _execute_one()
+                source_devices[source_dir] = None
+        device = source_devices[source_dir]
+        if device is not None and device != dir_devices.get(dest.parent):
+            return True
+    return False
+
+
+def _copy_file(source: str, dest: Path):
+    """
+    Copy a file's data and metadata like shutil.copy2().
+
+    shutil.copyfile() uses the kernel's zero-copy path (sendfile on Linux,
+    fcopyfile on macOS) when given plain str paths. Large files on Linux
+    are sent directly with a POSIX_FADV_SEQUENTIAL hint on the source, so
+    readahead is sized for a streaming read.
+    """
+    source, dest = str(source), str(dest)
+
+    if sys.platform.startswith('linux') and os.path.getsize(source) >= LARGE_FILE_BYTES:
+        try:
+            _sendfile_sequential(source, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+    else:
+        shutil.copyfile(source, dest)
+
+    shutil.copystat(source, dest)
+
+
+def _sendfile_sequential(source: str, dest: str):
+    """Copy source to dest with os.sendfile() after a sequential-read hint."""
+    with open(source, 'rb') as fsrc, open(dest, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        offset = 0
+        while True:
+            sent = os.sendfile(dst_fd, src_fd, offset, SENDFILE_CHUNK)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _move_file(source: str, dest: Path):
+    """Move a file, trying a single rename() before shutil.move()."""
+    try:
+        os.rename(source, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Different filesystem: fall back to copy + unlink
+        shutil.move(source, dest)
+
+
 def dry_run_organization(state: OrganizerState) -> OrganizerState:
     """Preview organization without executing."""
     state["dry_run"] = True
@@ -21,13 +21,12 @@ def validate_input(state: OrganizerState) -> OrganizerState:
         Updated state with errors list (if any validation fails)
     """
     input_paths = state.get("input_paths", [])
-    errors = state.get("errors", []).copy()
-    warnings = state.get("warnings", []).copy()
+    errors = state.setdefault("errors", [])
+    warnings = state.setdefault("warnings", [])
 
     # Check if we have any input paths
     if not input_paths:
         errors.append("No input paths provided")
-        state["errors"] = errors
         return state
 
     # Validate each path
@@ -50,14 +49,9 @@ def validate_input(state: OrganizerState) -> OrganizerState:
         except Exception as e:
             errors.append(f"Cannot access {path_str}: {str(e)}")
 
-    # Update state
-    state["errors"] = errors
-    state["warnings"] = warnings
-
     # If no valid paths, stop here
     if not valid_paths:
         if not errors:
             errors.append("No valid input paths found")
-            state["errors"] = errors
 
     return state
@@ -39,13 +39,12 @@ def analyze_with_llm(state: OrganizerState) -> OrganizerState:
 
     llm_provider = state.get("llm_provider", "ollama")
     llm_model = state.get("llm_model")
-    errors = state.get("errors", []).copy()
-    warnings = state.get("warnings", []).copy()
+    errors = state.setdefault("errors", [])
+    warnings = state.setdefault("warnings", [])
 
     # Check if we have files to analyze
     if not files:
         errors.append("No files to analyze")
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
         return state
 
@@ -54,7 +53,6 @@ def analyze_with_llm(state: OrganizerState) -> OrganizerState:
         provider = _create_provider(llm_provider, llm_model)
     except Exception as e:
         errors.append(f"Failed to create LLM provider: {str(e)}")
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
         return state
 
@@ -62,7 +60,6 @@ def analyze_with_llm(state: OrganizerState) -> OrganizerState:
     if not provider.is_available():
         error_msg = _get_provider_unavailable_message(llm_provider, llm_model)
         errors.append(error_msg)
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
         return state
 
@@ -82,24 +79,17 @@ def analyze_with_llm(state: OrganizerState) -> OrganizerState:
         update_progress("analyze_with_llm", "complete")
     except ProviderNotAvailableError as e:
         errors.append(f"Provider not available: {str(e)}")
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
     except ProviderAPIError as e:
         errors.append(f"Provider API error: {str(e)}")
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
     except ProviderParseError as e:
         errors.append(f"Failed to parse provider response: {str(e)}")
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
     except Exception as e:
         errors.append(f"Unexpected error during LLM analysis: {str(e)}")
-        state["errors"] = errors
         update_progress("analyze_with_llm", "error")
 
-    state["errors"] = errors
-    state["warnings"] = warnings
-
     show_summary(state)
 
     try:
@@ -107,7 +97,6 @@ def analyze_with_llm(state: OrganizerState) -> OrganizerState:
     except Exception as e:
         # Don't fail if preferences can't be applied
         warnings.append(f"Could not apply preferences: {str(e)}")
-        state["warnings"] = warnings
 
     return state
 
@@ -8,11 +8,25 @@ Adjusts:
 - Confidence scores (boost preferred strategies)
 """
 
+from functools import lru_cache
 from typing import List, Optional
 from shared.models.suggestions import SuggestionResponse, Suggestion
 from shared.learning.preference_store import PreferenceStore
 
 
+# Default folder names from the suggestion prompt -> scene type they hold
+DEFAULT_FOLDER_SCENES = (
+    ("selfies", "selfie"),
+    ("beach & pool", "beach"),
+    ("city & travel", "city-street"),
+    ("music & events", "music"),
+    ("art & culture", "art"),
+    ("sports & fitness", "sports"),
+    ("portraits", "portrait"),
+    ("home", "home-indoor"),
+)
+
+
 def apply_preferences(
     suggestions: SuggestionResponse,
     store: Optional[PreferenceStore] = None
@@ -36,6 +50,7 @@ def apply_preferences(
 
     # Get strategy ranking
     strategy_ranking = store.get_strategy_ranking()
+    rank_map = {strategy: i for i, strategy in enumerate(strategy_ranking)}
 
     # Score and sort suggestions
     scored_suggestions = []
@@ -43,8 +58,8 @@ def apply_preferences(
         strategy = _detect_strategy(sugg.folder_structure.base_path)
 
         # Calculate preference boost
-        if strategy in strategy_ranking:
-            rank = strategy_ranking.index(strategy)
+        rank = rank_map.get(strategy)
+        if rank is not None:
             preference_boost = (len(strategy_ranking) - rank) * 0.05
         else:
             preference_boost = 0
@@ -57,7 +72,7 @@ def apply_preferences(
 
         scored_suggestions.append((
             new_confidence,
-            strategy_ranking.index(strategy) if strategy in strategy_ranking else 99,
+            rank_map.get(strategy, 99),
             sugg,
             new_confidence
         ))
@@ -82,6 +97,7 @@ def apply_preferences(
     )
 
 
+@lru_cache(maxsize=256)
 def _detect_strategy(base_path: str) -> str:
     """Detect strategy type from base path."""
     base_lower = base_path.lower()
@@ -98,24 +114,18 @@ def _detect_strategy(base_path: str) -> str:
 
 def _apply_folder_names(sugg: Suggestion, store: PreferenceStore) -> Suggestion:
     """Apply user's preferred folder names."""
-    default_to_scene = {
-        "selfies": "selfie",
-        "beach & pool": "beach",
-        "city & travel": "city-street",
-        "music & events": "music",
-        "art & culture": "art",
-        "sports & fitness": "sports",
-        "portraits": "portrait",
-        "home": "home-indoor",
-    }
-
     for folder in sugg.folder_structure.folders:
-        folder_lower = folder.name.lower()
-
-        for default_name, scene_type in default_to_scene.items():
-            if default_name in folder_lower or folder_lower in default_name:
-                preferred = store.get_preferred_folder_name(scene_type, folder.name)
-                folder.name = preferred
-                break
+        scene_type = _default_folder_scene(folder.name.lower())
+        if scene_type is not None:
+            folder.name = store.get_preferred_folder_name(scene_type, folder.name)
 
     return sugg
+
+
+@lru_cache(maxsize=256)
+def _default_folder_scene(folder_lower: str) -> Optional[str]:
+    """Scene type of the default folder name matching a lowercased folder name."""
+    for default_name, scene_type in DEFAULT_FOLDER_SCENES:
+        if default_name in folder_lower or folder_lower in default_name:
+            return scene_type
+    return None
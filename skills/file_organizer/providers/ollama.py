@@ -6,11 +6,12 @@ Ollama runs models locally for privacy and no API costs.
 Default model: llava:7b (fast, good quality)
 """
 
-import json
 import requests
 from typing import Optional, List
 from shared.models.file_metadata import FileMetadata
 from shared.models.suggestions import SuggestionResponse
+from shared.providers.http import create_session, list_installed_models
+from shared.utils import fast_json
 from shared.providers.base import (
     BaseLLMProvider,
     ProviderNotAvailableError,
@@ -37,15 +38,27 @@ class OllamaProvider(BaseLLMProvider):
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.timeout = timeout
+        # Keep-alive connection pool reused by every call
+        self._session = create_session(pool_connections=4, pool_maxsize=8)
+
+    def close(self):
+        """Release pooled HTTP connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def is_available(self) -> bool:
         """Check if Ollama is running and accessible."""
         try:
-            response = requests.get(
-                f"{self.base_url}/api/tags",
-                timeout=5
-            )
-            return response.status_code == 200
+            # The model listing is cached for a short TTL across providers
+            list_installed_models(self._session, self.base_url)
+            return True
         except (requests.RequestException, Exception):
             return False
 
@@ -93,7 +106,9 @@ class OllamaProvider(BaseLLMProvider):
         payload = {
             "model": self.get_model_name(),
             "prompt": prompt,
-            "stream": False,
+            # Stream tokens so the timeout applies between chunks rather
+            # than to the whole multi-thousand-token generation
+            "stream": True,
             "format": schema,
             "options": {
                 "temperature": 0.5,
@@ -103,11 +118,18 @@ class OllamaProvider(BaseLLMProvider):
         }
 
         try:
-            response = requests.post(
+            with self._session.post(
                 self.api_url,
                 json=payload,
-                timeout=self.timeout
-            )
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    raise Exception(
+                        f"Ollama API error (status {response.status_code}): "
+                        f"{response.text}"
+                    )
+                return self._read_stream(response)
         except requests.Timeout:
             raise Exception(
                 f"Ollama request timed out after {self.timeout}s. "
@@ -116,21 +138,28 @@ class OllamaProvider(BaseLLMProvider):
         except requests.RequestException as e:
             raise Exception(f"Ollama connection error: {str(e)}")
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Ollama API error (status {response.status_code}): "
-                f"{response.text}"
-            )
-
-        try:
-            result = response.json()
-        except json.JSONDecodeError:
-            raise Exception(f"Invalid JSON from Ollama: {response.text[:200]}")
-
-        if "response" not in result:
-            raise Exception(f"Unexpected Ollama format: {result}")
-
-        return result["response"]
+    @staticmethod
+    def _read_stream(response) -> str:
+        """Join the response fragments of a streamed /api/generate reply."""
+        fragments = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                chunk = fast_json.loads(line)
+            except fast_json.JSONDecodeError:
+                raise Exception(f"Invalid JSON from Ollama: {line[:200]!r}")
+
+            if "error" in chunk:
+                raise Exception(f"Ollama API error: {chunk['error']}")
+            if "response" not in chunk:
+                raise Exception(f"Unexpected Ollama format: {chunk}")
+
+            fragments.append(chunk["response"])
+            if chunk.get("done"):
+                break
+
+        return "".join(fragments)
 
     def _parse_json_response(
         self,
@@ -141,8 +170,8 @@ class OllamaProvider(BaseLLMProvider):
         response_text = raw_response.strip()
 
         try:
-            data = json.loads(response_text)
-        except json.JSONDecodeError as e:
+            data = fast_json.loads(response_text)
+        except fast_json.JSONDecodeError as e:
             raise Exception(
                 f"Invalid JSON in response (schema enforcement failed?): {e}\n"
                 f"Response: {response_text[:500]}"
@@ -163,7 +192,7 @@ class OllamaProvider(BaseLLMProvider):
         except Exception as e:
             raise Exception(
                 f"Response doesn't match SuggestionResponse schema: {e}\n"
-                f"Data: {json.dumps(data, indent=2)[:500]}"
+                f"Data: {fast_json.dumps(data, indent=True)[:500]}"
             )
 
         return suggestion_response
@@ -181,13 +210,14 @@ class OllamaProvider(BaseLLMProvider):
             )
 
             # Pass 1: Remove hallucinated files + deduplicate
+            # (dict.fromkeys drops repeats within a folder, keeping order)
             seen = set()
             for folder in folders:
-                cleaned = []
-                for fname in folder.get("files", []):
-                    if fname in filename_set and fname not in seen:
-                        cleaned.append(fname)
-                        seen.add(fname)
+                cleaned = [
+                    fname for fname in dict.fromkeys(folder.get("files", []))
+                    if fname in filename_set and fname not in seen
+                ]
+                seen.update(cleaned)
                 folder["files"] = cleaned
 
             # Remove folders that ended up empty after cleaning
@@ -16,7 +16,7 @@ from pathlib import Path
 from datetime import datetime
 
 from shared.providers.embedding import OllamaEmbeddingProvider
-from shared.learning.embedding_store import EmbeddingStore
+from shared.learning.embedding_store import EmbeddingStore, get_embedding_store
 from skills.search.graph.search_graph import create_index_graph, create_search_graph
 
 
@@ -166,7 +166,7 @@ def _run_index(args):
 
 def _run_query(args):
     """Run a search query."""
-    store = EmbeddingStore()
+    store = get_embedding_store()
     stats = store.get_stats()
 
     if stats["total_files"] == 0:
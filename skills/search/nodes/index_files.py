@@ -7,29 +7,36 @@ Reuses v0.1's scanning/metadata infrastructure from shared/.
 
 import hashlib
 import mimetypes
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Union
 
-from shared.providers.embedding import OllamaEmbeddingProvider
+from shared.providers.embedding import (
+    OllamaEmbeddingProvider,
+    DEFAULT_SUB_BATCH,
+    DEFAULT_MAX_IN_FLIGHT,
+)
 from shared.learning.embedding_store import EmbeddingStore
 
 
 # ===== Constants =====
 
-SKIP_DIRECTORIES = {
+SKIP_DIRECTORIES = frozenset({
     '__pycache__', 'node_modules', '.git', '.svn', '.hg',
     'venv', 'env', '.venv', '.env',
     'build', 'dist', 'target', 'out',
     '.idea', '.vscode', '.vs',
     'bin', 'obj', '.cache', '.pytest_cache',
     '.mypy_cache', '.tox', '.eggs',
-}
+})
 
-SKIP_FILE_PATTERNS = {
+SKIP_FILE_PATTERNS = frozenset({
     '.DS_Store', 'Thumbs.db', 'desktop.ini',
     '.gitignore', '.gitkeep',
-}
+})
 
 TEXT_EXTENSIONS = {
     '.txt', '.md', '.markdown', '.rst', '.log',
@@ -55,6 +62,9 @@ DOCUMENT_EXTENSIONS = {
 AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.opus'}
 VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv'}
 
+# Threads hashing and reading files; the work is almost all waiting on IO
+DEFAULT_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 # Extension -> language name (for descriptions)
 LANG_MAP = {
     ".py": "Python", ".js": "JavaScript", ".ts": "TypeScript",
@@ -76,8 +86,8 @@ def scan_and_extract(state: dict) -> dict:
     """
     input_paths = state.get("input_paths", [])
     recursive = state.get("recursive", True)
-    errors = state.get("errors", []).copy()
-    warnings = state.get("warnings", []).copy()
+    errors = state.setdefault("errors", [])
+    warnings = state.setdefault("warnings", [])
 
     store = EmbeddingStore()
     file_metadata = []
@@ -85,40 +95,52 @@ def scan_and_extract(state: dict) -> dict:
 
     print("  [1/3] Scanning files...")
 
+    files = []
     for path_str in input_paths:
         path = Path(path_str)
         if path.is_file():
-            files = [path]
+            files.append(path)
         elif path.is_dir():
-            files = _scan_directory(path, recursive)
+            files.extend(_scan_directory(path, recursive))
         else:
             errors.append(f"Path does not exist: {path_str}")
-            continue
 
-        for file_path in files:
-            try:
-                # Compute file hash
-                file_hash = _compute_hash(file_path)
+    # One range query per input instead of one is_indexed() per file
+    indexed_hashes = store.get_file_hashes(
+        os.path.abspath(path_str) for path_str in input_paths
+    )
 
-                # Check if already indexed
-                if store.is_indexed(str(file_path), file_hash):
-                    skipped += 1
-                    continue
+    def process(file_path: Path) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            # Compute file hash
+            file_hash = _compute_hash(file_path)
 
-                # Extract metadata
-                meta = _extract_metadata(file_path, file_hash)
-                file_metadata.append(meta)
+            # Check if already indexed
+            if indexed_hashes.get(str(file_path.absolute())) == file_hash:
+                return None, None
+
+            # Extract metadata
+            return _extract_metadata(file_path, file_hash), None
+
+        except Exception as e:
+            return None, f"Error processing {file_path.name}: {e}"
 
-            except Exception as e:
-                warnings.append(f"Error processing {file_path.name}: {e}")
+    # Hashing and preview reads overlap on a thread pool; map() keeps
+    # results in scan order
+    with ThreadPoolExecutor(max_workers=DEFAULT_IO_WORKERS) as executor:
+        for meta, warning in executor.map(process, files):
+            if meta is not None:
+                file_metadata.append(meta)
+            elif warning is not None:
+                warnings.append(warning)
+            else:
+                skipped += 1
 
     found = len(file_metadata)
     print(f"       Found {found} new files, {skipped} already indexed")
 
     state["file_metadata"] = file_metadata
     state["files_skipped"] = skipped
-    state["errors"] = errors
-    state["warnings"] = warnings
     return state
 
 
@@ -161,7 +183,7 @@ def embed_and_store(state: dict) -> dict:
     Batches texts through Ollama embedding API for efficiency.
     """
     descriptions = state.get("descriptions", [])
-    errors = state.get("errors", []).copy()
+    errors = state.setdefault("errors", [])
 
     if not descriptions:
         state["files_indexed"] = 0
@@ -172,9 +194,9 @@ def embed_and_store(state: dict) -> dict:
     provider = OllamaEmbeddingProvider()
     store = EmbeddingStore()
 
-    # Batch embed
+    # Batch embed; each batch is split into concurrent sub-batch requests
     texts = [d["description"] for d in descriptions]
-    batch_size = 32
+    batch_size = DEFAULT_SUB_BATCH * DEFAULT_MAX_IN_FLIGHT
     indexed = 0
 
     for i in range(0, len(texts), batch_size):
@@ -184,17 +206,19 @@ def embed_and_store(state: dict) -> dict:
         try:
             embeddings = provider.embed_batch(batch_texts)
 
-            for j, (desc, embedding) in enumerate(zip(batch_descs, embeddings)):
-                store.save_embedding(
-                    file_path=desc["file_path"],
-                    file_name=desc["file_name"],
-                    embedding=embedding,
-                    content_type=desc.get("content_type"),
-                    summary=desc["description"][:200],
-                    file_hash=desc.get("file_hash"),
-                    file_modified=desc.get("file_modified"),
-                )
-                indexed += 1
+            # Write the whole batch in one transaction
+            indexed += store.add_embeddings_bulk(
+                {
+                    "file_path": desc["file_path"],
+                    "file_name": desc["file_name"],
+                    "embedding": embedding,
+                    "content_type": desc.get("content_type"),
+                    "summary": desc["description"][:200],
+                    "file_hash": desc.get("file_hash"),
+                    "file_modified": desc.get("file_modified"),
+                }
+                for desc, embedding in zip(batch_descs, embeddings)
+            )
 
         except Exception as e:
             errors.append(f"Embedding batch {i // batch_size + 1} failed: {e}")
@@ -205,40 +229,59 @@ def embed_and_store(state: dict) -> dict:
 
     print(f"       Embedded {indexed}/{len(texts)} files    ")
 
+    # Persist the embedding cache for the next run
+    provider.close()
+
     state["files_indexed"] = indexed
-    state["errors"] = errors
     return state
 
 
 # ===== Helper Functions =====
 
-def _scan_directory(directory: Path, recursive: bool = True) -> List[Path]:
-    """Recursively scan a directory for files."""
+def _scan_directory(directory: Union[str, Path], recursive: bool = True) -> List[Path]:
+    """
+    Recursively scan a directory for files.
+
+    Walks with an explicit stack rather than recursive calls, so depth is
+    unbounded and no Python frame is set up per subdirectory. Entries come
+    from os.scandir(), so file/directory checks need no stat().
+    """
     results = []
+    stack = deque([directory])
 
-    try:
-        items = list(directory.iterdir())
-    except PermissionError:
-        return results
+    # Local names avoid a global lookup per entry
+    skip_files = SKIP_FILE_PATTERNS
+    skip_dirs = SKIP_DIRECTORIES
 
-    for item in items:
-        if item.name.startswith('.'):
-            continue
-        if item.name in SKIP_FILE_PATTERNS:
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except PermissionError:
             continue
 
-        if item.is_file():
-            results.append(item)
-        elif item.is_dir() and recursive:
-            if item.name not in SKIP_DIRECTORIES:
-                results.extend(_scan_directory(item, recursive))
+        for entry in entries:
+            name = entry.name
+            # Hidden entries and system files, in one test
+            if name[:1] == '.' or name in skip_files:
+                continue
+
+            if entry.is_file():
+                results.append(Path(entry.path))
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                # Like os.walk(), symlinked directories are not descended
+                # into, so a link cycle cannot loop the scan
+                if name not in skip_dirs:
+                    stack.append(entry.path)
 
     return results
 
 
 def _compute_hash(file_path: Path) -> str:
     """Compute a fast hash of a file (first 8KB + size)."""
-    hasher = hashlib.md5()
+    # Change detection only; BLAKE2b is faster than MD5 on 64-bit CPUs
+    hasher = hashlib.blake2b(digest_size=16)
     try:
         size = file_path.stat().st_size
         hasher.update(str(size).encode())
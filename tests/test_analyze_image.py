@@ -0,0 +1,48 @@
+"""
+Analyze Image Tests
+EXIF fields from the extractor reach ImageAnalysis.
+"""
+
+import importlib
+import sys
+from datetime import datetime
+
+from PIL import Image
+
+from shared.models.file_metadata import FileMetadata
+from shared.utils.exif_extractor import extract_exif_data
+
+# The nodes package re-exports the node function under the module's name
+importlib.import_module("skills.file_organizer.nodes.analyze_image")
+analyze_image = sys.modules["skills.file_organizer.nodes.analyze_image"]
+
+
+def test_create_image_analysis_uses_extracted_exif(tmp_path):
+    path = tmp_path / "beach.jpg"
+    exif = Image.Exif()
+    exif[0x010F] = "Apple"                      # Make
+    exif[0x0110] = "iPhone 15 Pro"              # Model
+    exif[0x0132] = "2025:11:10 18:30:00"        # DateTime
+    Image.new("RGB", (64, 48)).save(path, exif=exif)
+
+    exif_data = extract_exif_data(path)
+    stat = path.stat()
+    image_file = FileMetadata(
+        name=path.name,
+        path=str(path),
+        extension=".jpg",
+        size=stat.st_size,
+        modified_date=datetime.fromtimestamp(stat.st_mtime),
+        created_date=datetime.fromtimestamp(stat.st_ctime),
+        content_type="image",
+        parent_directory=tmp_path.name,
+    )
+
+    analysis = analyze_image._create_image_analysis(
+        image_file, exif_data, {"description": "A beach", "scene": "beach"}
+    )
+
+    assert analysis.camera_make == "Apple"
+    assert analysis.camera_model == "iPhone 15 Pro"
+    assert analysis.date_taken == datetime(2025, 11, 10, 18, 30)
+    assert analysis.image_dimensions == "64x48"